@@ -1,16 +1,118 @@
 """
 Working Brave Search MCP Client using docker exec to communicate with Brave Search container.
 This follows the same reliable pattern as working_mcp_client.py for filesystem operations.
+When the container publishes the MCP server over HTTP (BRAVE_MCP_URL), requests are sent
+over a pooled aiohttp session instead.
 """
 import asyncio
+import codecs
+import itertools
 import json
+import logging
+import os
+import re
+import signal
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+from types import MappingProxyType
 from typing import Any
 
+import aiohttp
+
+# orjson encodes straight to bytes and is several times faster; fall back to compact stdlib json
+try:
+    import orjson
+
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+    _loads = json.loads
+
+logger = logging.getLogger(__name__)
+
+# MCP protocol revision requested in the session handshake; servers may answer with an older one
+MCP_PROTOCOL_VERSION = "2025-03-26"
+
+# Only this protocol revision allows JSON-RPC batch arrays
+_BATCH_PROTOCOL_VERSIONS = frozenset({"2025-03-26"})
+
+# Size of each read from the session's stdout
+_READ_CHUNK_SIZE = 64 * 1024
+
+# Undecodable data beyond this size is discarded up to the next newline
+_MAX_BUFFERED_MESSAGE = 16 * 1024 * 1024
+
+# Whitespace allowed between JSON-RPC messages on the stream
+_WHITESPACE = re.compile(r"\s*")
+
+# Seconds to wait for a JSON-RPC response before giving up on the session
+BRAVE_REQUEST_TIMEOUT = float(os.getenv("BRAVE_REQUEST_TIMEOUT", "60"))
+
+# Requests in flight at once when a batch has to be sent as single requests
+_MAX_PIPELINED = 8
+
+# Upper bound on cached search results kept per client
+_CACHE_MAX_ENTRIES = 512
+
+# Streamable HTTP transport: connection pool size and keep-alive for the MCP endpoint
+_HTTP_POOL_LIMIT = 32
+_HTTP_KEEPALIVE_TIMEOUT = 60
+
+# Container -> time `docker inspect` last confirmed it running; later clients skip the check
+_RUNNING_CONTAINERS: dict[str, float] = {}
+_RUNNING_TTL = 30
+
+# Tools exposed by the Brave Search MCP server; shared read-only by every client
+_AVAILABLE_TOOLS = MappingProxyType({
+    "brave_web_search": {
+        "description": "Search the web using Brave Search API",
+        "parameters": {
+            "query": "Search query string",
+            "count": "Number of results (default: 5, max: 20)"
+        }
+    },
+    "brave_image_search": {
+        "description": "Search for images using Brave Search API", 
+        "parameters": {
+            "searchTerm": "Image search term",
+            "count": "Number of images (default: 1, max: 3)"
+        }
+    },
+    "brave_local_search": {
+        "description": "Search for local businesses and places",
+        "parameters": {
+            "query": "Local search query (e.g. 'pizza near Central Park')",
+            "count": "Number of results (default: 10, max: 20)"
+        }
+    },
+    "brave_news_search": {
+        "description": "Search for news articles",
+        "parameters": {
+            "query": "News search query",
+            "count": "Number of results (default: 10, max: 20)",
+            "freshness": "Time filter (pd, pw, pm, py or date range)"
+        }
+    },
+    "brave_video_search": {
+        "description": "Search for videos",
+        "parameters": {
+            "query": "Video search query", 
+            "count": "Number of results (default: 10, max: 20)",
+            "freshness": "Time filter (pd, pw, pm, py or date range)"
+        }
+    }
+})
 
 class BraveSearchClient:
     """
     Brave Search MCP client that uses docker exec to communicate with Brave Search container.
-    This follows the same reliable pattern as the filesystem client.
+    A single long-lived `docker exec -i` process holds the MCP stdio session, and tool
+    calls are multiplexed over it by JSON-RPC request id. If an MCP HTTP endpoint is
+    configured, the same JSON-RPC messages are POSTed to it over a shared connection pool.
     """
     
     def __init__(self, config: dict[str, Any] | None = None):
@@ -24,155 +126,370 @@ class BraveSearchClient:
         
         self.container_name = config.get("container_name", "agent-framework-mcp-brave-search-1")
         self.server_path = config.get("server_path", "/app")
+        self.url = os.getenv("BRAVE_MCP_URL") or config.get("url")
+        self.request_timeout = float(config.get("request_timeout", BRAVE_REQUEST_TIMEOUT))
         self.is_initialized = False
-        self.available_tools = {
-            "brave_web_search": {
-                "description": "Search the web using Brave Search API",
-                "parameters": {
-                    "query": "Search query string",
-                    "count": "Number of results (default: 5, max: 20)"
-                }
-            },
-            "brave_image_search": {
-                "description": "Search for images using Brave Search API", 
-                "parameters": {
-                    "searchTerm": "Image search term",
-                    "count": "Number of images (default: 1, max: 3)"
-                }
-            },
-            "brave_local_search": {
-                "description": "Search for local businesses and places",
-                "parameters": {
-                    "query": "Local search query (e.g. 'pizza near Central Park')",
-                    "count": "Number of results (default: 10, max: 20)"
-                }
-            },
-            "brave_news_search": {
-                "description": "Search for news articles",
-                "parameters": {
-                    "query": "News search query",
-                    "count": "Number of results (default: 10, max: 20)",
-                    "freshness": "Time filter (pd, pw, pm, py or date range)"
-                }
-            },
-            "brave_video_search": {
-                "description": "Search for videos",
-                "parameters": {
-                    "query": "Video search query", 
-                    "count": "Number of results (default: 10, max: 20)",
-                    "freshness": "Time filter (pd, pw, pm, py or date range)"
-                }
-            }
-        }
+        self.available_tools = _AVAILABLE_TOOLS
+
+        # Persistent MCP session state (stdio process or HTTP connection pool)
+        self._proc: asyncio.subprocess.Process | None = None
+        self._http: aiohttp.ClientSession | None = None
+        self._http_session_id: str | None = None
+        self._protocol_version = MCP_PROTOCOL_VERSION
+        self._loop: asyncio.AbstractEventLoop | None = None
+        # Set once the initialize handshake completes; an open transport alone is not a session
+        self._handshake_done = False
+        self._reader_task: asyncio.Task | None = None
+        self._pending: dict[int, asyncio.Future] = {}
+        self._id_gen = itertools.count(1)
+        self._supports_batch = False
+        # Set once a batch goes unanswered; such servers drop JSON-RPC arrays silently
+        self._batch_dropped = False
+        self._session_lock: asyncio.Lock | None = None
+        self._session_lock_loop: asyncio.AbstractEventLoop | None = None
+
+        # TTL cache for identical tool calls and coalescing of concurrent duplicates
+        self._cache: OrderedDict[tuple, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._cache_ttl = int(os.getenv("BRAVE_CACHE_TTL", "300"))
+        self._inflight: dict[tuple, asyncio.Future] = {}
         
     async def initialize(self) -> bool:
         """Initialize connection to Brave Search MCP container"""
         try:
-            print("🔄 Initializing Brave Search MCP Client...")
-            print(f"   Container: {self.container_name}")
-            print(f"   Base Path: {self.server_path}")
-            
-            # Test container accessibility
-            result = await self._run_docker_command(["ls", "-la", self.server_path])
+            logger.info(
+                "🔄 Initializing Brave Search MCP Client (container: %s, url: %s)",
+                self.container_name, self.url or 'docker exec'
+            )
             
-            if result["success"]:
-                print("✅ Brave Search container connection successful")
-                self.is_initialized = True
-                return True
-            else:
-                print(f"❌ Brave Search container connection failed: {result['error']}")
+            if not self.url and not await self._container_running():
+                logger.warning("❌ Brave Search container is not running: %s", self.container_name)
+                return False
+
+            # Start the long-lived MCP server process used by every tool call
+            if not await self._start_session():
+                logger.warning("❌ Brave Search MCP session handshake failed")
                 return False
+
+            logger.info("✅ Brave Search container connection successful")
+            self.is_initialized = True
+            return True
                 
         except Exception as e:
-            print(f"❌ Brave Search MCP client initialization failed: {e}")
+            logger.error("❌ Brave Search MCP client initialization failed: %s", e)
             return False
     
-    async def _run_docker_command(self, command: list[str]) -> dict[str, Any]:
-        """Execute command in docker container"""
+    async def _container_running(self) -> bool:
+        """Check on the host that the container is running, without exec-ing into it"""
+        checked_at = _RUNNING_CONTAINERS.get(self.container_name)
+        if checked_at is not None and time.monotonic() - checked_at < _RUNNING_TTL:
+            return True
+
         try:
-            full_command = ["docker", "exec", self.container_name] + command
-            
-            # Run command asynchronously
             process = await asyncio.create_subprocess_exec(
-                *full_command,
+                "docker", "inspect", "-f", "{{.State.Running}}", self.container_name,
                 stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
+                stderr=asyncio.subprocess.DEVNULL
             )
-            
-            stdout, stderr = await process.communicate()
-            
-            return {
-                "success": process.returncode == 0,
-                "output": stdout.decode('utf-8', errors='replace'),
-                "error": stderr.decode('utf-8', errors='replace'),
-                "returncode": process.returncode
-            }
-            
-        except Exception as e:
-            return {
-                "success": False,
-                "output": "",
-                "error": f"Command execution failed: {e}",
-                "returncode": -1
-            }
-    
+            stdout, _ = await process.communicate()
+        except OSError:
+            return False
+
+        running = process.returncode == 0 and stdout.strip() == b"true"
+        if running:
+            _RUNNING_CONTAINERS[self.container_name] = time.monotonic()
+        return running
+
+    async def _start_session(self) -> bool:
+        """Spawn the persistent MCP server process and perform the protocol handshake"""
+        await self._stop_session()
+
+        self._loop = asyncio.get_running_loop()
+        self._protocol_version = MCP_PROTOCOL_VERSION
+        if self.url:
+            self._http = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=_HTTP_POOL_LIMIT,
+                    keepalive_timeout=_HTTP_KEEPALIVE_TIMEOUT
+                )
+            )
+        else:
+            self._proc = await asyncio.create_subprocess_exec(
+                "docker", "exec", "-i", self.container_name, "node", "/app/dist/index.js",
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL
+            )
+            self._reader_task = asyncio.create_task(self._reader_loop(self._proc))
+
+        # A failed handshake must not leave the process or connection pool behind
+        try:
+            response = await self._send_request("initialize", {
+                "protocolVersion": MCP_PROTOCOL_VERSION,
+                "capabilities": {},
+                "clientInfo": {"name": "agent-framework", "version": "0.1.0"}
+            })
+            if "error" in response or "protocolVersion" not in response:
+                logger.warning("❌ Brave Search MCP initialize failed: %s", response.get("error", response))
+                await self._stop_session()
+                return False
+            self._protocol_version = response["protocolVersion"]
+            self._supports_batch = self._protocol_version in _BATCH_PROTOCOL_VERSIONS and not self._batch_dropped
+
+            await self._send_message({"jsonrpc": "2.0", "method": "notifications/initialized"})
+        except BaseException:
+            await self._stop_session()
+            raise
+
+        self._handshake_done = True
+        return True
+
+    async def _ensure_session(self) -> bool:
+        """Start the session if needed, letting only one caller spawn it at a time"""
+        if self._session_alive():
+            return True
+
+        # Locks bind to a loop, and Streamlit reruns bring a new one
+        loop = asyncio.get_running_loop()
+        if self._session_lock_loop is not loop:
+            self._session_lock = asyncio.Lock()
+            self._session_lock_loop = loop
+
+        async with self._session_lock:
+            if self._session_alive():
+                return True
+            return await self._start_session()
+
+    def _session_alive(self) -> bool:
+        """Check the session is open, initialized and bound to the current event loop"""
+        if not self._handshake_done:
+            return False
+        if self.url:
+            if self._http is None or self._http.closed:
+                return False
+        elif self._proc is None or self._proc.returncode is not None:
+            return False
+        # Pipes belong to the loop that spawned the process; Streamlit reruns use a fresh loop
+        return self._loop is asyncio.get_running_loop()
+
+    async def _stop_session(self, reason: str = "Brave Search MCP session closed"):
+        """Shut down the persistent MCP server process or HTTP connection pool"""
+        proc, self._proc = self._proc, None
+        http, self._http = self._http, None
+        reader_task, self._reader_task = self._reader_task, None
+        same_loop = self._loop is asyncio.get_running_loop()
+        self._loop = None
+        self._http_session_id = None
+        self._handshake_done = False
+
+        # A pool left behind by a closed loop cannot be awaited; its sockets go with that loop
+        if http is not None and same_loop:
+            await http.close()
+
+        if proc is not None and proc.returncode is None:
+            if same_loop:
+                # Closing stdin lets the server exit cleanly before we fall back to SIGTERM
+                proc.stdin.close()
+                try:
+                    await asyncio.wait_for(proc.wait(), timeout=2)
+                except TimeoutError:
+                    proc.terminate()
+                    await proc.wait()
+            else:
+                try:
+                    os.kill(proc.pid, signal.SIGTERM)
+                except ProcessLookupError:
+                    pass
+
+        if reader_task is not None and same_loop:
+            reader_task.cancel()
+        self._fail_pending(reason)
+
+    def _fail_pending(self, reason: str):
+        """Resolve all in-flight requests with an error"""
+        for future in self._pending.values():
+            if not future.done():
+                future.set_result({"error": reason})
+        self._pending.clear()
+
+    async def _send_message(self, message: dict[str, Any] | list[dict[str, Any]]):
+        """Write a single newline-delimited JSON-RPC message or batch to the session"""
+        if self.url:
+            await self._post_message(message)
+            return
+        self._proc.stdin.write(_dumps(message) + b"\n")
+        await self._proc.stdin.drain()
+
+    async def _post_message(self, message: dict[str, Any] | list[dict[str, Any]]):
+        """POST a JSON-RPC message to the MCP HTTP endpoint and dispatch any responses"""
+        headers = {
+            "Accept": "application/json, text/event-stream",
+            "Content-Type": "application/json",
+            "MCP-Protocol-Version": self._protocol_version
+        }
+        if self._http_session_id:
+            headers["Mcp-Session-Id"] = self._http_session_id
+
+        async with self._http.post(self.url, data=_dumps(message), headers=headers) as response:
+            expired = response.status == 404 and self._http_session_id is not None
+            if not expired:
+                response.raise_for_status()
+                self._http_session_id = response.headers.get("Mcp-Session-Id", self._http_session_id)
+
+            # Notifications are acknowledged with 202 and no body
+            if expired or response.status == 202:
+                messages = []
+            elif response.content_type == "text/event-stream":
+                messages = self._parse_sse(await response.text())
+            else:
+                messages = [await response.json(loads=_loads, content_type=None)]
+
+        if expired:
+            # The server dropped our session; start a new one on the next call
+            await self._stop_session()
+            raise ConnectionError("Brave Search MCP HTTP session expired")
+
+        for received in messages:
+            self._dispatch_message(received)
+
+    @staticmethod
+    def _parse_sse(body: str) -> list[Any]:
+        """Extract the JSON payloads from a server-sent events stream"""
+        messages = []
+        for event in body.replace("\r\n", "\n").split("\n\n"):
+            data = "\n".join(
+                line[5:].lstrip(" ") for line in event.split("\n") if line.startswith("data:")
+            )
+            if data:
+                try:
+                    messages.append(_loads(data))
+                except ValueError:
+                    continue
+        return messages
+
+    async def _send_request(self, method: str, params: dict[str, Any]) -> dict[str, Any]:
+        """Send a JSON-RPC request and wait for the response with the matching id"""
+        request_id = next(self._id_gen)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        session = self._proc or self._http
+        try:
+            async with asyncio.timeout(self.request_timeout):
+                await self._send_message({
+                    "jsonrpc": "2.0",
+                    "id": request_id,
+                    "method": method,
+                    "params": params
+                })
+                return await future
+        except TimeoutError:
+            self._pending.pop(request_id, None)
+            reason = f"Brave Search MCP {method} timed out after {self.request_timeout:g}s"
+            logger.warning("⏱️ %s; restarting the session", reason)
+            await self._abandon_session(session, reason)
+            return {"error": reason}
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def _abandon_session(self, session: Any, reason: str):
+        """Tear down an unresponsive session, failing its other requests, so the next call restarts it"""
+        # Another caller may already have replaced it
+        if session is not None and session is (self._proc or self._http):
+            await self._stop_session(reason)
+
+    async def _send_batch(self, requests: list[tuple[str, dict[str, Any]]]) -> list[dict[str, Any]]:
+        """Send several JSON-RPC requests as one batch array and collect responses in order"""
+        loop = asyncio.get_running_loop()
+        request_ids = [next(self._id_gen) for _ in requests]
+        futures = [loop.create_future() for _ in requests]
+        self._pending.update(zip(request_ids, futures))
+        try:
+            async with asyncio.timeout(self.request_timeout):
+                await self._send_message([
+                    {"jsonrpc": "2.0", "id": request_id, "method": method, "params": params}
+                    for request_id, (method, params) in zip(request_ids, requests)
+                ])
+                return list(await asyncio.gather(*futures))
+        finally:
+            for request_id in request_ids:
+                self._pending.pop(request_id, None)
+
+    def _dispatch_message(self, message: Any):
+        """Dispatch a decoded message; batch requests are answered with an array of responses"""
+        for response in message if isinstance(message, list) else (message,):
+            self._dispatch_response(response)
+
+    def _dispatch_response(self, response: Any):
+        """Resolve the pending request matching a JSON-RPC response"""
+        # Skip server-initiated requests/notifications and unknown ids
+        if not isinstance(response, dict) or "method" in response:
+            return
+        future = self._pending.get(response.get("id"))
+        if future is None or future.done():
+            return
+
+        if "error" in response:
+            future.set_result({"error": f"MCP Server Error: {response['error']}"})
+        else:
+            future.set_result(response.get("result", {}))
+
+    async def _reader_loop(self, proc: asyncio.subprocess.Process):
+        """Route JSON-RPC responses from the server to their pending requests"""
+        decoder = json.JSONDecoder()
+        utf8 = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        buffer = ""
+        try:
+            while chunk := await proc.stdout.read(_READ_CHUNK_SIZE):
+                # Fast path: whole newline-delimited messages are decoded straight from bytes
+                if not buffer and chunk.endswith(b"\n") and not utf8.getstate()[0]:
+                    try:
+                        messages = [_loads(line) for line in chunk.splitlines() if line.strip()]
+                    except ValueError:
+                        pass
+                    else:
+                        for message in messages:
+                            self._dispatch_message(message)
+                        continue
+
+                buffer += utf8.decode(chunk)
+
+                # Messages are decoded as complete JSON values, so framing does not depend on newlines.
+                # Walk the buffer by index and trim it once per chunk rather than once per message.
+                pos = 0
+                while (pos := _WHITESPACE.match(buffer, pos).end()) < len(buffer):
+                    try:
+                        message, pos = decoder.raw_decode(buffer, pos)
+                    except json.JSONDecodeError:
+                        if buffer[pos] in "{[" and len(buffer) - pos < _MAX_BUFFERED_MESSAGE:
+                            break  # wait for the rest of the message
+                        # Not JSON-RPC (e.g. a stray log line); drop it
+                        newline = buffer.find("\n", pos)
+                        pos = newline + 1 if newline != -1 else len(buffer)
+                        continue
+                    self._dispatch_message(message)
+                buffer = buffer[pos:]
+        except (ValueError, ConnectionError) as e:
+            self._fail_pending(f"Brave Search MCP session failed: {e}")
+        finally:
+            # A session without a reader can never complete requests, so retire it
+            if self._proc is proc:
+                self._proc = None
+                self._fail_pending("Brave Search MCP server exited")
+            if proc.returncode is None:
+                try:
+                    proc.terminate()
+                except ProcessLookupError:
+                    pass
+
     async def _run_mcp_tool(self, tool_name: str, params: dict[str, Any]) -> dict[str, Any]:
-        """Execute Brave Search MCP tool via docker exec and JSON-RPC communication"""
+        """Execute Brave Search MCP tool over the persistent JSON-RPC session"""
         try:
-            # Create JSON-RPC request
-            request_id = f"{tool_name}_{hash(str(params))}"
-            json_rpc_request = {
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "method": "tools/call",
-                "params": {
-                    "name": tool_name,
-                    "arguments": params
-                }
-            }
-            
-            # Convert to JSON string
-            request_json = json.dumps(json_rpc_request)
-            
-            # Execute MCP server via docker exec
-            # MCP servers expect JSON-RPC via stdin/stdout
-            result = await self._run_docker_command([
-                "sh", "-c", 
-                f"echo '{request_json}' | node /app/dist/index.js"
-            ])
-            
-            if not result["success"]:
-                return {"error": f"Docker exec failed: {result['error']}"}
-            
-            # Parse JSON-RPC response
-            try:
-                response_json = result["output"].strip()
-                if not response_json:
-                    return {"error": "Empty response from MCP server"}
-                
-                # Handle potential multiple JSON responses (split by newlines)
-                lines = response_json.strip().split('\n')
-                for line in lines:
-                    if line.strip():
-                        try:
-                            response = json.loads(line)
-                            if response.get("id") == request_id and "result" in response:
-                                return response["result"]
-                            elif "error" in response:
-                                return {"error": f"MCP Server Error: {response['error']}"}
-                        except json.JSONDecodeError:
-                            continue
-                
-                # If no valid JSON-RPC response found, return raw output
-                return {
-                    "content": [{
-                        "type": "text",
-                        "text": response_json
-                    }]
-                }
-                
-            except json.JSONDecodeError as e:
-                return {"error": f"Failed to parse MCP response: {e}. Raw output: {result['output'][:500]}"}
+            if not await self._ensure_session():
+                return {"error": "Brave Search MCP session could not be started"}
+
+            return await self._send_request("tools/call", {
+                "name": tool_name,
+                "arguments": params
+            })
                 
         except Exception as e:
             return {"error": f"Failed to execute Brave Search MCP tool: {e}"}
@@ -185,22 +502,133 @@ class BraveSearchClient:
         if tool_name not in self.available_tools:
             return {"error": f"Unknown tool: {tool_name}. Available: {list(self.available_tools.keys())}"}
         
+        key = self._cache_key(tool_name, arguments)
+        cached = self._get_cached(key)
+        if cached is not None:
+            return cached
+
+        # Concurrent identical calls share a single upstream request
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        result: dict[str, Any] = {"error": "Tool execution cancelled"}
         try:
             # Call the MCP tool inside the container
             result = await self._run_mcp_tool(tool_name, arguments)
-            return result
+            if "error" not in result and not result.get("isError"):
+                self._put_cached(key, result)
                 
         except Exception as e:
-            return {"error": f"Tool execution failed: {e}"}
+            result = {"error": f"Tool execution failed: {e}"}
+        finally:
+            self._inflight.pop(key, None)
+            if not future.done():
+                future.set_result(result)
+
+        return result
+
+    async def call_tools_batch(self, calls: list[tuple[str, dict[str, Any]]]) -> list[dict[str, Any]]:
+        """Execute several Brave Search MCP tools in a single JSON-RPC batch"""
+        if len(calls) <= 1 or not self.is_initialized:
+            return [await self.call_tool(tool_name, arguments) for tool_name, arguments in calls]
+
+        results: list[dict[str, Any] | None] = [None] * len(calls)
+        misses: list[tuple[int, tuple]] = []
+        for index, (tool_name, arguments) in enumerate(calls):
+            if tool_name not in self.available_tools:
+                results[index] = {"error": f"Unknown tool: {tool_name}. Available: {list(self.available_tools.keys())}"}
+                continue
+            key = self._cache_key(tool_name, arguments)
+            results[index] = self._get_cached(key)
+            if results[index] is None:
+                misses.append((index, key))
+
+        if misses:
+            try:
+                if not await self._ensure_session():
+                    raise RuntimeError("Brave Search MCP session could not be started")
+
+                responses = None
+                if self._supports_batch:
+                    try:
+                        responses = await self._send_batch([
+                            ("tools/call", {"name": calls[index][0], "arguments": calls[index][1]})
+                            for index, _ in misses
+                        ])
+                    except TimeoutError:
+                        # The server accepted the array but never answered it; stop batching and retry singly
+                        logger.warning("⏱️ Brave Search MCP batch went unanswered; sending requests singly")
+                        self._supports_batch = False
+                        self._batch_dropped = True
+                if responses is None:
+                    # Without batch support, pipeline the requests on the session instead, a few at a time
+                    slots = asyncio.Semaphore(_MAX_PIPELINED)
+
+                    async def call_limited(tool_name: str, arguments: dict[str, Any]) -> dict[str, Any]:
+                        async with slots:
+                            return await self.call_tool(tool_name, arguments)
+
+                    responses = await asyncio.gather(*(
+                        call_limited(*calls[index]) for index, _ in misses
+                    ))
+            except Exception as e:
+                responses = [{"error": f"Tool execution failed: {e}"}] * len(misses)
+
+            for (index, key), result in zip(misses, responses):
+                if "error" not in result and not result.get("isError"):
+                    self._put_cached(key, result)
+                results[index] = result
+
+        return results
+
+    @staticmethod
+    def _cache_key(tool_name: str, arguments: dict[str, Any]) -> tuple:
+        """Build a hashable cache key from a tool name and its arguments"""
+        key = (tool_name, tuple(sorted(arguments.items())))
+        try:
+            hash(key)
+        except TypeError:
+            # Nested lists/dicts are not hashable; fall back to a canonical JSON form
+            key = (tool_name, json.dumps(arguments, sort_keys=True, default=str))
+        return key
+
+    def _get_cached(self, key: tuple) -> dict[str, Any] | None:
+        """Return a cached result if it is still within the TTL"""
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] >= self._cache_ttl:
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return entry[1]
+
+    def _put_cached(self, key: tuple, result: dict[str, Any]):
+        """Store a successful result, evicting the least recently used entries"""
+        if self._cache_ttl <= 0:
+            return
+        self._cache[key] = (time.monotonic(), result)
+        self._cache.move_to_end(key)
+        while len(self._cache) > _CACHE_MAX_ENTRIES:
+            self._cache.popitem(last=False)
     
-    def get_available_tools(self) -> dict[str, dict]:
+    @property
+    def supports_batch(self) -> bool:
+        """Whether call_tools_batch sends a single JSON-RPC batch rather than separate requests"""
+        return self._supports_batch
+
+    def get_available_tools(self) -> Mapping[str, dict]:
         """Get list of available Brave Search MCP tools"""
         return self.available_tools
     
     async def close(self):
         """Close Brave Search MCP client connection"""
         self.is_initialized = False
-        print("🔌 Brave Search MCP client closed")
+        await self._stop_session()
+        logger.info("🔌 Brave Search MCP client closed")
 
 
 async def test_brave_search_client():
@@ -220,35 +648,37 @@ async def test_brave_search_client():
     for tool_name, tool_info in client.get_available_tools().items():
         print(f"   • {tool_name}: {tool_info['description']}")
     
+    # The searches are independent, so they share the session concurrently
+    web_result, image_result = await asyncio.gather(
+        client.call_tool("brave_web_search", {
+            "query": "Python programming", 
+            "count": 3
+        }),
+        client.call_tool("brave_image_search", {
+            "searchTerm": "python logo",
+            "count": 2
+        })
+    )
+    
     # Test web search
     print("\n🔍 Testing web search...")
-    result = await client.call_tool("brave_web_search", {
-        "query": "Python programming", 
-        "count": 3
-    })
-    
-    if "error" not in result:
+    if "error" not in web_result:
         print("✅ Web search successful")
-        if "content" in result:
-            content = result["content"][0]["text"]
+        if "content" in web_result:
+            content = web_result["content"][0]["text"]
             print(f"   Results: {content[:200]}...")
     else:
-        print(f"❌ Web search failed: {result['error']}")
+        print(f"❌ Web search failed: {web_result['error']}")
     
     # Test image search
     print("\n🖼️ Testing image search...")
-    result = await client.call_tool("brave_image_search", {
-        "searchTerm": "python logo",
-        "count": 2
-    })
-    
-    if "error" not in result:
+    if "error" not in image_result:
         print("✅ Image search successful")
-        if "content" in result:
-            content = result["content"][0]["text"]
+        if "content" in image_result:
+            content = image_result["content"][0]["text"]
             print(f"   Results: {content[:200]}...")
     else:
-        print(f"❌ Image search failed: {result['error']}")
+        print(f"❌ Image search failed: {image_result['error']}")
     
     await client.close()
     
@@ -256,4 +686,10 @@ async def test_brave_search_client():
 
 
 if __name__ == "__main__":
-    asyncio.run(test_brave_search_client())
+    # Prefer uvloop via the shared runner when mcp_integration is importable
+    try:
+        from utils.event_loop import run_event_loop
+    except ImportError:
+        run_event_loop = asyncio.run
+    
+    run_event_loop(test_brave_search_client())
@@ -4,8 +4,107 @@ This provides a reliable way to interact with MCP filesystem containers
 without the TaskGroup errors we encountered with stdio_client.
 """
 import asyncio
+import functools
+import logging
+import os
+import posixpath
+import shlex
+import signal
+import subprocess
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
 from typing import Any
 
+logger = logging.getLogger(__name__)
+
+# Shared pool for blocking docker exec calls; also caps how many run at once
+_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="docker-exec")
+
+# Shell output is read in pieces of at most this size rather than buffered whole
+_SHELL_READ_LIMIT = 256 * 1024
+
+# Cap on directory listing/search output kept per call; the rest is dropped as it streams in
+MCP_FS_MAX_OUTPUT = int(os.getenv("MCP_FS_MAX_OUTPUT", str(1024 * 1024)))
+_TRUNCATED_MARKER = "\n[truncated]"
+
+# Cap on stderr kept per command; it is still drained in full so the shell never blocks on it
+_MAX_STDERR = 64 * 1024
+
+# Seconds a single command may run before its shell is killed and the call fails
+MCP_FS_COMMAND_TIMEOUT = float(os.getenv("MCP_FS_COMMAND_TIMEOUT", "60"))
+
+# Writes up to this size are sent through a pooled shell as an argument; larger ones (or NULs) stream
+# over stdin to their own exec, which keeps them clear of the container's argument limits
+_INLINE_WRITE_LIMIT = 64 * 1024
+
+# (container, base path) -> time the path was last confirmed reachable; later clients skip the probe
+_PROBED_ROOTS: dict[tuple[str, str], float] = {}
+_PROBE_TTL = 30
+
+# Persistent shells kept per client, so concurrent commands don't queue behind one another
+MCP_FS_SHELLS = int(os.getenv("MCP_FS_SHELLS", "4"))
+
+# Seconds a list_directory/get_file_info result is reused; 0 disables the cache
+MCP_FS_CACHE_TTL = float(os.getenv("MCP_FS_CACHE_TTL", "5"))
+_CACHE_MAX_ENTRIES = 256
+
+
+# Tools exposed by the filesystem MCP server; shared read-only by every client
+_AVAILABLE_TOOLS = MappingProxyType({
+    "list_directory": {
+        "description": "List contents of a directory",
+        "parameters": {"path": "Directory path to list"}
+    },
+    "read_file": {
+        "description": "Read contents of a text file",
+        "parameters": {"path": "File path to read"}
+    },
+    "write_file": {
+        "description": "Write content to a file",
+        "parameters": {"path": "File path to write", "content": "Content to write"}
+    },
+    "create_directory": {
+        "description": "Create a new directory",
+        "parameters": {"path": "Directory path to create"}
+    },
+    "move_file": {
+        "description": "Move or rename a file",
+        "parameters": {"source": "Source path", "destination": "Destination path"}
+    },
+    "get_file_info": {
+        "description": "Get file metadata and information",
+        "parameters": {"path": "File path to inspect"}
+    },
+    "search_files": {
+        "description": "Search for files matching a pattern",
+        "parameters": {"pattern": "Search pattern", "path": "Directory to search in"}
+    },
+    "directory_tree": {
+        "description": "Get directory tree structure",
+        "parameters": {"path": "Root directory path", "max_depth": "Maximum depth (optional)"}
+    }
+})
+
+
+def _run_sync(command: list[str], stdin_bytes: bytes | None, timeout: float) -> subprocess.CompletedProcess:
+    """Run a command to completion, capturing stdout and stderr as bytes; killed after timeout"""
+    return subprocess.run(command, input=stdin_bytes, capture_output=True, timeout=timeout)
+
+
+@functools.lru_cache(maxsize=1024)
+def _resolve_in_root(root: str, path: str) -> str:
+    """Normalise path relative to root, raising ValueError if it escapes root"""
+    root = posixpath.normpath(root)
+    # Relative paths are taken from root; normpath folds away any '..' segments
+    resolved = posixpath.normpath(posixpath.join(root, path))
+    if resolved != root and not resolved.startswith(root.rstrip("/") + "/"):
+        raise ValueError(f"Path '{path}' is outside {root}")
+    return resolved
+
 
 class FilesystemClient:
     """
@@ -24,83 +123,274 @@ class FilesystemClient:
         
         self.container_name = config.get("container_name", "agent-framework-mcp-filesystem-1")
         self.server_path = config.get("server_path", "/projects")
+        self.command_timeout = float(config.get("command_timeout", MCP_FS_COMMAND_TIMEOUT))
+        # docker exec argv prefixes, built once rather than per command
+        self._exec_prefix = ("docker", "exec", self.container_name)
+        self._exec_stdin_prefix = ("docker", "exec", "-i", self.container_name)
         self.is_initialized = False
-        self.available_tools = {
-            "list_directory": {
-                "description": "List contents of a directory",
-                "parameters": {"path": "Directory path to list"}
-            },
-            "read_file": {
-                "description": "Read contents of a text file",
-                "parameters": {"path": "File path to read"}
-            },
-            "write_file": {
-                "description": "Write content to a file",
-                "parameters": {"path": "File path to write", "content": "Content to write"}
-            },
-            "create_directory": {
-                "description": "Create a new directory",
-                "parameters": {"path": "Directory path to create"}
-            },
-            "move_file": {
-                "description": "Move or rename a file",
-                "parameters": {"source": "Source path", "destination": "Destination path"}
-            },
-            "get_file_info": {
-                "description": "Get file metadata and information",
-                "parameters": {"path": "File path to inspect"}
-            },
-            "search_files": {
-                "description": "Search for files matching a pattern",
-                "parameters": {"pattern": "Search pattern", "path": "Directory to search in"}
-            },
-            "directory_tree": {
-                "description": "Get directory tree structure",
-                "parameters": {"path": "Root directory path", "max_depth": "Maximum depth (optional)"}
-            }
-        }
+        
+        # Pool of long-lived `docker exec -i <container> sh` processes that commands are sent through;
+        # each runs one batch at a time, and shells are spawned on demand up to pool_size
+        self.pool_size = max(1, int(config.get("pool_size", MCP_FS_SHELLS)))
+        self._shells: set[asyncio.subprocess.Process] = set()
+        self._idle_shells: list[asyncio.subprocess.Process] = []
+        self._shell_slots: asyncio.Semaphore | None = None
+        # One-off execs (large writes, fallbacks) are bounded separately from the shells
+        self._exec_slots: asyncio.Semaphore | None = None
+        self._shell_loop: asyncio.AbstractEventLoop | None = None
+        # Marks the end of each command's output; random so file contents can't forge it
+        self._sentinel = f"__MCP_END_{uuid.uuid4().hex}__"
+        # (tool_name, path) -> (timestamp, result) for recent read-only lookups
+        self._cache: OrderedDict[tuple, tuple[float, dict[str, Any]]] = OrderedDict()
+        # Bumped by every write; lookups only cache results if no write finished while they ran
+        self._cache_generation = 0
+        
+        self.available_tools = _AVAILABLE_TOOLS
         
     async def initialize(self) -> bool:
         """Initialize connection to MCP container"""
         try:
-            print("🔄 Initializing Working MCP Client...")
-            print(f"   Container: {self.container_name}")
-            print(f"   Base Path: {self.server_path}")
+            logger.info(
+                "🔄 Initializing Working MCP Client (container: %s, base path: %s)",
+                self.container_name, self.server_path
+            )
             
-            # Test container accessibility
-            result = await self._run_docker_command(["ls", "-la", self.server_path])
+            # A recent successful probe of the same container and path is good enough
+            probe_key = (self.container_name, self.server_path)
+            probed_at = _PROBED_ROOTS.get(probe_key)
+            if probed_at is not None and time.monotonic() - probed_at < _PROBE_TTL:
+                logger.info("✅ Container connection recently verified")
+                self.is_initialized = True
+                return True
+            
+            # Test container accessibility; the probe's shell stays pooled for the first tool call.
+            # Only list the directory when debugging, otherwise a bare existence check will do
+            verbose = logger.isEnabledFor(logging.DEBUG)
+            probe = ["ls", "-la", self.server_path] if verbose else ["test", "-d", self.server_path]
+            result = await self._run_docker_command(probe)
             
             if result["success"]:
-                print("✅ Container connection successful")
-                print(f"   Available directories: {len(result['output'].splitlines())} items")
+                logger.info("✅ Container connection successful")
+                if verbose:
+                    logger.debug("   Available directories: %d items", len(result['output'].splitlines()))
+                _PROBED_ROOTS[probe_key] = time.monotonic()
                 self.is_initialized = True
                 return True
             else:
-                print(f"❌ Container connection failed: {result['error']}")
+                logger.warning(
+                    "❌ Container connection failed: %s",
+                    result['error'] or f"{self.server_path} is not a directory"
+                )
                 return False
                 
         except Exception as e:
-            print(f"❌ MCP client initialization failed: {e}")
+            logger.error("❌ MCP client initialization failed: %s", e)
             return False
     
-    async def _run_docker_command(self, command: list[str]) -> dict[str, Any]:
-        """Execute command in docker container"""
-        try:
-            full_command = ["docker", "exec", self.container_name] + command
-            
-            # Run command asynchronously
-            process = await asyncio.create_subprocess_exec(
-                *full_command,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
+    async def _run_docker_command(
+        self, command: list[str], stdin_bytes: bytes | None = None, max_output: int | None = None
+    ) -> dict[str, Any]:
+        """Execute command in docker container, optionally feeding stdin_bytes to it and capping its output"""
+        # The shell's stdin carries the commands themselves, so input needs its own exec
+        if stdin_bytes is None:
+            results = await self._run_shell_commands([(command, max_output)])
+            if results is not None:
+                return results[0]
+        return await self._run_exec_command(command, stdin_bytes, max_output)
+    
+    async def _run_docker_batch(self, commands: list[tuple[list[str], int | None]]) -> list[dict[str, Any]]:
+        """Execute several (command, max_output) pairs in one round trip, returning results in order"""
+        results = await self._run_shell_commands(commands)
+        if results is None:
+            results = await asyncio.gather(
+                *(self._run_exec_command(command, None, max_output) for command, max_output in commands)
             )
+        return results
+    
+    def _shell_pool(self) -> asyncio.Semaphore:
+        """Get the semaphore bounding shells in use, resetting the pool if the event loop changed"""
+        # Pipes and semaphores bind to a loop, and Streamlit reruns bring a new one
+        loop = asyncio.get_running_loop()
+        if self._shell_loop is not loop:
+            self._kill_shells()
+            self._shell_slots = asyncio.Semaphore(self.pool_size)
+            self._exec_slots = asyncio.Semaphore(self.pool_size)
+            self._shell_loop = loop
+        return self._shell_slots
+    
+    async def _acquire_shell(self) -> asyncio.subprocess.Process:
+        """Take an idle live shell, or spawn one; the caller must hold a pool slot"""
+        while self._idle_shells:
+            shell = self._idle_shells.pop()
+            if shell.returncode is None:
+                return shell
+            self._shells.discard(shell)
+        
+        shell = await asyncio.create_subprocess_exec(
+            *self._exec_stdin_prefix, "sh",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            limit=_SHELL_READ_LIMIT
+        )
+        self._shells.add(shell)
+        return shell
+    
+    async def _run_shell_commands(self, commands: list[tuple[list[str], int | None]]) -> list[dict[str, Any]] | None:
+        """Run commands through a pooled persistent shell, or return None if no shell is usable"""
+        async with self._shell_pool():
+            shell = None
+            try:
+                shell = await self._acquire_shell()
+                
+                # Commands read /dev/null so they can't swallow the commands queued after them;
+                # both streams then get a sentinel line, stdout's carrying the exit status
+                sentinel = self._sentinel
+                shell.stdin.write("".join(
+                    f"{shlex.join(command)} </dev/null; "
+                    f"printf '\\n{sentinel} %d\\n' \"$?\"; "
+                    f"printf '\\n{sentinel}\\n' >&2\n"
+                    for command, _ in commands
+                ).encode('utf-8'))
+                await shell.stdin.drain()
+                
+                # The whole batch was written up front; collect each command's output in turn
+                out_end = f"\n{sentinel} ".encode()
+                err_end = f"\n{sentinel}\n".encode()
+                
+                async def read_stdout(max_output: int | None) -> tuple[bytes, bool, int]:
+                    stdout, truncated = await self._read_until(shell.stdout, out_end, max_output)
+                    return stdout, truncated, int(await shell.stdout.readline())
+                
+                raw = []
+                for _, max_output in commands:
+                    # Drain both streams at once: a full stderr pipe would stall the command
+                    async with asyncio.timeout(self.command_timeout):
+                        (stdout, truncated, returncode), (stderr, _) = await asyncio.gather(
+                            read_stdout(max_output),
+                            self._read_until(shell.stderr, err_end, _MAX_STDERR)
+                        )
+                    raw.append((stdout, truncated, stderr, returncode))
+            except TimeoutError:
+                # A stuck command pins its shell; drop the shell (without waiting on pipes its
+                # children may still hold open) and fail the rest of the batch
+                self._kill_shell(shell)
+                error = f"Command timed out after {self.command_timeout:g}s"
+                logger.warning("⏱️ %s: %s", error, shlex.join(commands[len(raw)][0]))
+                return [
+                    *self._shell_results(raw),
+                    *({"success": False, "output": "", "error": error, "returncode": -1}
+                      for _ in commands[len(raw):])
+                ]
+            except (OSError, ValueError, asyncio.IncompleteReadError):
+                # Dead shell; the caller falls back to one-off execs
+                if shell is not None:
+                    self._kill_shell(shell)
+                    await shell.wait()
+                return None
+            except BaseException:
+                # Cancelled mid-command: unread output would corrupt the next call
+                if shell is not None:
+                    self._kill_shell(shell)
+                raise
             
-            stdout, stderr = await process.communicate()
+            self._idle_shells.append(shell)
+        
+        return self._shell_results(raw)
+    
+    def _shell_results(self, raw: list[tuple[bytes, bool, bytes, int]]) -> list[dict[str, Any]]:
+        """Build command results from (stdout, truncated, stderr, returncode) tuples"""
+        return [
+            {
+                "success": returncode == 0,
+                "output": self._decode_output(stdout, truncated),
+                "error": "" if returncode == 0 else stderr.decode('utf-8', errors='replace'),
+                "returncode": returncode
+            }
+            for stdout, truncated, stderr, returncode in raw
+        ]
+    
+    @staticmethod
+    async def _read_until(stream: asyncio.StreamReader, end: bytes, max_output: int | None) -> tuple[bytes, bool]:
+        """Read up to and past the end marker, keeping at most max_output bytes; returns (data, truncated)"""
+        kept = bytearray()
+        truncated = False
+        while True:
+            try:
+                piece = (await stream.readuntil(end))[:-len(end)]
+                found = True
+            except asyncio.LimitOverrunError as e:
+                # More than a buffer's worth before the marker: take the part that can't contain it
+                piece = await stream.readexactly(e.consumed)
+                found = False
+            
+            if max_output is None:
+                kept += piece
+            else:
+                room = max_output - len(kept)
+                if len(piece) > room:
+                    truncated = True
+                kept += piece[:max(room, 0)]
+            
+            if found:
+                return bytes(kept), truncated
+    
+    @staticmethod
+    def _decode_output(output: bytes, truncated: bool) -> str:
+        """Decode command output, marking it if it was cut short"""
+        text = output.decode('utf-8', errors='replace')
+        return text + _TRUNCATED_MARKER if truncated else text
+    
+    def _kill_shell(self, shell: asyncio.subprocess.Process):
+        """Discard a persistent shell without waiting for it"""
+        self._shells.discard(shell)
+        if shell.returncode is None:
+            # Signal by pid; the process transport may belong to a loop that is already closed
+            try:
+                os.kill(shell.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+    
+    def _kill_shells(self):
+        """Discard every pooled shell without waiting for them"""
+        for shell in list(self._shells):
+            self._kill_shell(shell)
+        self._idle_shells.clear()
+    
+    @staticmethod
+    async def _exit_shell(shell: asyncio.subprocess.Process):
+        """Ask a shell to exit before falling back to killing it"""
+        try:
+            shell.stdin.write(b"exit\n")
+            await shell.stdin.drain()
+            await asyncio.wait_for(shell.wait(), timeout=2)
+        except (TimeoutError, OSError):
+            shell.kill()
+            await shell.wait()
+    
+    async def _run_exec_command(
+        self, command: list[str], stdin_bytes: bytes | None = None, max_output: int | None = None
+    ) -> dict[str, Any]:
+        """Execute command with a one-off docker exec, optionally feeding stdin_bytes to it"""
+        try:
+            prefix = self._exec_prefix if stdin_bytes is None else self._exec_stdin_prefix
+            full_command = [*prefix, *command]
+            
+            # Run command on the shared pool so the event loop is not blocked
+            self._shell_pool()
+            async with self._exec_slots:
+                process = await asyncio.get_running_loop().run_in_executor(
+                    _EXECUTOR, _run_sync, full_command, stdin_bytes, self.command_timeout
+                )
+            success = process.returncode == 0
+            stdout = process.stdout
+            truncated = max_output is not None and len(stdout) > max_output
             
             return {
-                "success": process.returncode == 0,
-                "output": stdout.decode('utf-8', errors='replace'),
-                "error": stderr.decode('utf-8', errors='replace'),
+                "success": success,
+                "output": self._decode_output(stdout[:max_output] if truncated else stdout, truncated),
+                # stderr is only reported on failure, so skip decoding it otherwise
+                "error": "" if success else process.stderr.decode('utf-8', errors='replace'),
                 "returncode": process.returncode
             }
             
@@ -114,12 +404,144 @@ class FilesystemClient:
     
     def _safe_path(self, path: str) -> str:
         """Ensure path is safe and within server boundaries"""
-        if not path.startswith('/'):
-            path = f"{self.server_path}/{path}"
+        return _resolve_in_root(self.server_path, path)
+    
+    def _plan_tool(self, tool_name: str, arguments: dict[str, Any]) -> tuple | None:
+        """
+        Work out how to run a tool: (command, stdin_bytes, max_output, describe, error_prefix).
+        max_output caps how much output is kept (None keeps it all); describe turns the
+        command's output into the text returned on success. None if the tool has no planner.
+        """
+        planner = self._PLANNERS.get(tool_name)
+        return planner(self, arguments) if planner is not None else None
+    
+    def _plan_list_directory(self, arguments: dict[str, Any]) -> tuple:
+        """List a directory with `ls -la`"""
+        path = self._safe_path(arguments.get("path", self.server_path))
+        return (
+            ["ls", "-la", path], None, MCP_FS_MAX_OUTPUT,
+            lambda output: f"Directory listing for {path}:\n{output}",
+            "Failed to list directory"
+        )
+    
+    def _plan_read_file(self, arguments: dict[str, Any]) -> tuple:
+        """Read a file with `cat`"""
+        path = self._safe_path(arguments.get("path", ""))
+        return ["cat", path], None, None, lambda output: output, "Failed to read file"
+    
+    def _plan_write_file(self, arguments: dict[str, Any]) -> tuple:
+        """Write a file with `printf`, or by piping large content into `cat`"""
+        path = self._safe_path(arguments.get("path", ""))
+        content = arguments.get("content", "")
+        data = content.encode('utf-8')
         
-        # Basic path safety (expand this as needed)
-        path = path.replace('..', '')
-        return path
+        # Content and path are passed as arguments or stdin so neither is parsed by the shell
+        if len(data) <= _INLINE_WRITE_LIMIT and "\0" not in content:
+            command, stdin_bytes = ["sh", "-c", 'printf %s "$2" > "$1"', "sh", path, content], None
+        else:
+            command, stdin_bytes = ["sh", "-c", 'cat > "$1"', "sh", path], data
+        return (
+            command, stdin_bytes, None,
+            lambda output: f"Successfully wrote to {path}",
+            "Failed to write file"
+        )
+    
+    def _plan_create_directory(self, arguments: dict[str, Any]) -> tuple:
+        """Create a directory and any missing parents"""
+        path = self._safe_path(arguments.get("path", ""))
+        return (
+            ["mkdir", "-p", path], None, None,
+            lambda output: f"Directory created: {path}",
+            "Failed to create directory"
+        )
+    
+    def _plan_get_file_info(self, arguments: dict[str, Any]) -> tuple:
+        """Show file metadata with `stat`"""
+        path = self._safe_path(arguments.get("path", ""))
+        return (
+            ["stat", path], None, None,
+            lambda output: f"File info for {path}:\n{output}",
+            "Failed to get file info"
+        )
+    
+    def _plan_search_files(self, arguments: dict[str, Any]) -> tuple:
+        """Find files under a directory whose names match a pattern"""
+        pattern = arguments.get("pattern", "*")
+        search_path = self._safe_path(arguments.get("path", self.server_path))
+        return (
+            ["find", search_path, "-name", pattern, "-type", "f"], None, MCP_FS_MAX_OUTPUT,
+            lambda output: f"Files matching '{pattern}' in {search_path}:\n{output}",
+            "Search failed"
+        )
+    
+    def _plan_directory_tree(self, arguments: dict[str, Any]) -> tuple:
+        """List the directories under a path down to max_depth"""
+        path = self._safe_path(arguments.get("path", self.server_path))
+        max_depth = arguments.get("max_depth", 3)
+        return (
+            ["find", path, "-maxdepth", str(max_depth), "-type", "d"], None, MCP_FS_MAX_OUTPUT,
+            lambda output: f"Directory tree for {path}:\n{output}",
+            "Failed to get directory tree"
+        )
+    
+    # Tool name -> planner; tools listed in available_tools without one report "not implemented"
+    _PLANNERS = {
+        "list_directory": _plan_list_directory,
+        "read_file": _plan_read_file,
+        "write_file": _plan_write_file,
+        "create_directory": _plan_create_directory,
+        "get_file_info": _plan_get_file_info,
+        "search_files": _plan_search_files,
+        "directory_tree": _plan_directory_tree,
+    }
+    
+    # Cheap, idempotent lookups whose results are briefly reused
+    _CACHEABLE_TOOLS = frozenset({"list_directory", "get_file_info"})
+    # Tools that change the tree and so drop every cached lookup
+    _MUTATING_TOOLS = frozenset({"write_file", "create_directory"})
+    
+    def _get_cached(self, key: tuple) -> dict[str, Any] | None:
+        """Return a cached result if it is still within the TTL"""
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] >= MCP_FS_CACHE_TTL:
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return entry[1]
+    
+    def _put_cached(self, key: tuple, result: dict[str, Any], generation: int):
+        """Store a successful lookup started at generation, evicting the least recently used entries"""
+        if MCP_FS_CACHE_TTL <= 0 or "error" in result or generation != self._cache_generation:
+            return
+        self._cache[key] = (time.monotonic(), result)
+        self._cache.move_to_end(key)
+        while len(self._cache) > _CACHE_MAX_ENTRIES:
+            self._cache.popitem(last=False)
+    
+    def _invalidate_cache(self):
+        """Drop every cached lookup, including results of lookups still in flight"""
+        self._cache.clear()
+        self._cache_generation += 1
+    
+    def _cache_key(self, tool_name: str, arguments: dict[str, Any]) -> tuple | None:
+        """Cache key for a cacheable tool call, or None if the call must always run"""
+        if tool_name not in self._CACHEABLE_TOOLS:
+            return None
+        return (tool_name, self._safe_path(arguments.get("path", ".")))
+    
+    @staticmethod
+    def _tool_result(result: dict[str, Any], describe, error_prefix: str) -> dict[str, Any]:
+        """Turn a command result into an MCP tool result"""
+        if result["success"]:
+            return {
+                "content": [{
+                    "type": "text",
+                    "text": describe(result["output"])
+                }]
+            }
+        return {"error": f"{error_prefix}: {result['error']}"}
     
     async def call_tool(self, tool_name: str, arguments: dict[str, Any]) -> dict[str, Any]:
         """Execute MCP tool via docker commands"""
@@ -129,130 +551,108 @@ class FilesystemClient:
         if tool_name not in self.available_tools:
             return {"error": f"Unknown tool: {tool_name}"}
         
+        generation = self._cache_generation
         try:
-            if tool_name == "list_directory":
-                path = self._safe_path(arguments.get("path", self.server_path))
-                result = await self._run_docker_command(["ls", "-la", path])
-                
-                if result["success"]:
-                    return {
-                        "content": [{
-                            "type": "text",
-                            "text": f"Directory listing for {path}:\n{result['output']}"
-                        }]
-                    }
-                else:
-                    return {"error": f"Failed to list directory: {result['error']}"}
-            
-            elif tool_name == "read_file":
-                path = self._safe_path(arguments.get("path", ""))
-                result = await self._run_docker_command(["cat", path])
-                
-                if result["success"]:
-                    return {
-                        "content": [{
-                            "type": "text", 
-                            "text": result["output"]
-                        }]
-                    }
-                else:
-                    return {"error": f"Failed to read file: {result['error']}"}
-            
-            elif tool_name == "write_file":
-                path = self._safe_path(arguments.get("path", ""))
-                content = arguments.get("content", "")
-                
-                # Use echo to write content (for simple cases)
-                result = await self._run_docker_command([
-                    "sh", "-c", f"echo '{content}' > {path}"
-                ])
-                
-                if result["success"]:
-                    return {
-                        "content": [{
-                            "type": "text",
-                            "text": f"Successfully wrote to {path}"
-                        }]
-                    }
-                else:
-                    return {"error": f"Failed to write file: {result['error']}"}
-            
-            elif tool_name == "create_directory":
-                path = self._safe_path(arguments.get("path", ""))
-                result = await self._run_docker_command(["mkdir", "-p", path])
-                
-                if result["success"]:
-                    return {
-                        "content": [{
-                            "type": "text",
-                            "text": f"Directory created: {path}"
-                        }]
-                    }
-                else:
-                    return {"error": f"Failed to create directory: {result['error']}"}
-            
-            elif tool_name == "get_file_info":
-                path = self._safe_path(arguments.get("path", ""))
-                result = await self._run_docker_command(["stat", path])
-                
-                if result["success"]:
-                    return {
-                        "content": [{
-                            "type": "text",
-                            "text": f"File info for {path}:\n{result['output']}"
-                        }]
-                    }
-                else:
-                    return {"error": f"Failed to get file info: {result['error']}"}
+            key = self._cache_key(tool_name, arguments)
+            if key is not None:
+                cached = self._get_cached(key)
+                if cached is not None:
+                    return cached
             
-            elif tool_name == "search_files":
-                pattern = arguments.get("pattern", "*")
-                search_path = self._safe_path(arguments.get("path", self.server_path))
-                result = await self._run_docker_command([
-                    "find", search_path, "-name", pattern, "-type", "f"
-                ])
-                
-                if result["success"]:
-                    return {
-                        "content": [{
-                            "type": "text",
-                            "text": f"Files matching '{pattern}' in {search_path}:\n{result['output']}"
-                        }]
-                    }
-                else:
-                    return {"error": f"Search failed: {result['error']}"}
-            
-            elif tool_name == "directory_tree":
-                path = self._safe_path(arguments.get("path", self.server_path))
-                max_depth = arguments.get("max_depth", 3)
-                result = await self._run_docker_command([
-                    "find", path, "-maxdepth", str(max_depth), "-type", "d"
-                ])
-                
-                if result["success"]:
-                    return {
-                        "content": [{
-                            "type": "text",
-                            "text": f"Directory tree for {path}:\n{result['output']}"
-                        }]
-                    }
-                else:
-                    return {"error": f"Failed to get directory tree: {result['error']}"}
-            
-            else:
+            plan = self._plan_tool(tool_name, arguments)
+            if plan is None:
                 return {"error": f"Tool {tool_name} not implemented"}
+            
+            command, stdin_bytes, max_output, describe, error_prefix = plan
+            output = await self._run_docker_command(command, stdin_bytes, max_output)
+            result = self._tool_result(output, describe, error_prefix)
+            if key is not None:
+                self._put_cached(key, result, generation)
+            return result
                 
         except Exception as e:
             return {"error": f"Tool execution failed: {e}"}
+        finally:
+            if tool_name in self._MUTATING_TOOLS:
+                self._invalidate_cache()
+    
+    async def call_tools_batch(self, calls: list[tuple[str, dict[str, Any]]]) -> list[dict[str, Any]]:
+        """Execute several tools, sending every command that needs no stdin in one shell round trip"""
+        if not self.is_initialized:
+            return [{"error": "MCP client not initialized"}] * len(calls)
+        
+        results: list[dict[str, Any] | None] = [None] * len(calls)
+        keys: list[tuple | None] = [None] * len(calls)
+        generation = self._cache_generation
+        batched = []
+        direct = []
+        # Lookups running alongside a write may see either state; don't keep those results
+        mutating = any(tool_name in self._MUTATING_TOOLS for tool_name, _ in calls)
+        for index, (tool_name, arguments) in enumerate(calls):
+            if tool_name not in self.available_tools:
+                results[index] = {"error": f"Unknown tool: {tool_name}"}
+                continue
+            try:
+                if not mutating:
+                    keys[index] = self._cache_key(tool_name, arguments)
+                    if keys[index] is not None:
+                        results[index] = self._get_cached(keys[index])
+                        if results[index] is not None:
+                            continue
+                plan = self._plan_tool(tool_name, arguments)
+            except Exception as e:
+                results[index] = {"error": f"Tool execution failed: {e}"}
+                continue
+            if plan is None:
+                results[index] = {"error": f"Tool {tool_name} not implemented"}
+            elif plan[1] is None:
+                batched.append((index, plan))
+            else:
+                direct.append(index)
+        
+        async def run_batched():
+            try:
+                outputs = await self._run_docker_batch([(plan[0], plan[2]) for _, plan in batched])
+                for (index, (_, _, _, describe, error_prefix)), output in zip(batched, outputs):
+                    results[index] = self._tool_result(output, describe, error_prefix)
+                    if keys[index] is not None:
+                        self._put_cached(keys[index], results[index], generation)
+            except Exception as e:
+                for index, _ in batched:
+                    results[index] = {"error": f"Tool execution failed: {e}"}
+        
+        async def run_direct(index: int):
+            results[index] = await self.call_tool(*calls[index])
+        
+        # Commands fed through stdin need their own exec; run them alongside the batch
+        await asyncio.gather(
+            *([run_batched()] if batched else []),
+            *(run_direct(index) for index in direct)
+        )
+        if mutating:
+            # Writes sent in the shared batch skip call_tool, which is what drops stale lookups
+            self._invalidate_cache()
+        return results
     
-    def get_available_tools(self) -> dict[str, dict]:
+    def get_available_tools(self) -> Mapping[str, dict]:
         """Get list of available MCP tools"""
         return self.available_tools
     
     async def close(self):
         """Close MCP client connection"""
         self.is_initialized = False
-        print("🔌 Working MCP client closed")
+        self._invalidate_cache()
+        
+        if self._shell_loop is asyncio.get_running_loop():
+            # Idle shells can exit cleanly; any still mid-command are killed
+            idle = [shell for shell in self._idle_shells if shell.returncode is None]
+            self._shells.difference_update(idle)
+            self._idle_shells.clear()
+            await asyncio.gather(*(self._exit_shell(shell) for shell in idle))
+        self._kill_shells()
+        self._shell_slots = None
+        self._shell_loop = None
+        logger.info("🔌 Working MCP client closed")
 
 
 async def test_working_client():
@@ -272,13 +672,30 @@ async def test_working_client():
     for tool_name, tool_info in client.get_available_tools().items():
         print(f"   • {tool_name}: {tool_info['description']}")
     
+    async def write_then_read():
+        """Write the test file and, if that worked, read it back"""
+        write_result = await client.call_tool("write_file", {
+            "path": "/projects/mcp_data/test_file.txt",
+            "content": "Hello from Working MCP Client!"
+        })
+        if "error" in write_result:
+            return write_result, None
+        return write_result, await client.call_tool("read_file", {
+            "path": "/projects/mcp_data/test_file.txt"
+        })
+    
+    # The listing doesn't depend on the write, so both run at once
+    result, (write_result, read_result) = await asyncio.gather(
+        client.call_tool("list_directory", {"path": "/projects"}),
+        write_then_read()
+    )
+    
     # Test directory listing
     print("\n📁 Testing directory listing...")
-    result = await client.call_tool("list_directory", {"path": "/projects"})
     if "error" not in result:
         print("✅ Directory listing successful")
         content = result["content"][0]["text"]
-        lines = content.split('\n')[:5]  # First 5 lines
+        lines = content.split('\n', 5)[:5]  # First 5 lines, without splitting the rest
         for line in lines:
             if line.strip():
                 print(f"   {line}")
@@ -288,20 +705,9 @@ async def test_working_client():
     # Test file creation and reading
     print("\n📝 Testing file operations...")
     
-    # Create a test file
-    write_result = await client.call_tool("write_file", {
-        "path": "/projects/mcp_data/test_file.txt",
-        "content": "Hello from Working MCP Client!"
-    })
-    
     if "error" not in write_result:
         print("✅ File write successful")
         
-        # Read the file back
-        read_result = await client.call_tool("read_file", {
-            "path": "/projects/mcp_data/test_file.txt"
-        })
-        
         if "error" not in read_result:
             content = read_result["content"][0]["text"].strip()
             print(f"✅ File read successful: '{content}'")
@@ -310,7 +716,7 @@ async def test_working_client():
     else:
         print(f"❌ File write failed: {write_result['error']}")
     
-    # Test search
+    # Test search; it runs after the write so the test file can be found
     print("\n🔍 Testing file search...")
     search_result = await client.call_tool("search_files", {
         "pattern": "*.txt",
@@ -333,4 +739,10 @@ async def test_working_client():
 
 
 if __name__ == "__main__":
-    asyncio.run(test_working_client())
\ No newline at end of file
+    # Prefer uvloop via the shared runner when mcp_integration is importable
+    try:
+        from utils.event_loop import run_event_loop
+    except ImportError:
+        run_event_loop = asyncio.run
+    
+    run_event_loop(test_working_client())
\ No newline at end of file
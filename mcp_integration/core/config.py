@@ -2,6 +2,7 @@
 Configuration for MCP integration.
 Loads environment variables and provides default settings.
 """
+import functools
 import os
 from pathlib import Path
 from typing import Any
@@ -10,38 +11,63 @@ from dotenv import load_dotenv
 
 # Load .env file from parent directory (now two levels up)
 env_path = Path(__file__).parent.parent.parent / ".env"
-load_dotenv(env_path)
 
-# Configuration settings
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-BRAVE_API_KEY = os.getenv("BRAVE_API_KEY")
+# Settings resolved lazily from the environment on first access
+_SETTING_NAMES = ("OPENAI_API_KEY", "BRAVE_API_KEY")
+
+
+@functools.cache
+def _load() -> dict[str, str | None]:
+    """Read .env once and return the configuration settings"""
+    load_dotenv(env_path)
+    settings = {name: os.getenv(name) for name in _SETTING_NAMES}
+
+    # Validate required settings
+    if not settings["OPENAI_API_KEY"]:
+        raise ValueError("OPENAI_API_KEY is required. Please set it in .env file.")
+    return settings
+
+
+def __getattr__(name: str) -> Any:
+    # Keeps `from .config import OPENAI_API_KEY` working without loading .env at import
+    if name in _SETTING_NAMES:
+        return _load()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# Validate required settings
-if not OPENAI_API_KEY:
-    raise ValueError("OPENAI_API_KEY is required. Please set it in .env file.")
 
 # Import plugin manager for dynamic server configuration
 # Note: This import is after the basic config to avoid circular imports
-from .plugin_manager import load_plugins
+from .plugin_manager import get_enabled_plugins, get_plugin
 
 # Get enabled servers
 def get_enabled_servers() -> dict[str, dict[str, Any]]:
     """Return only enabled plugins from plugin manager."""
-    plugins = load_plugins()
-    return {sid: cfg for sid, cfg in plugins.items() if cfg.get("enabled", False)}
+    return get_enabled_plugins()
 
 # Get server configuration
 def get_server_config(server_id: str) -> dict[str, Any]:
     """Return configuration for a specific server."""
-    return load_plugins().get(server_id, {})
-
-print("✅ Configuration loaded:")
-try:
-    enabled_servers = get_enabled_servers()
-    print(f"   - Enabled MCP Servers: {len(enabled_servers)}")
-    for server_id, config in enabled_servers.items():
-        print(f"     • {config.get('icon', '❓')} {config.get('name', server_id)} ({server_id})")
-except Exception as e:
-    print(f"   - MCP Servers: Plugin manager not yet available ({e})")
-print(f"   - OpenAI API Key: {'✅ Set' if OPENAI_API_KEY else '❌ Missing'}")
-print(f"   - Brave API Key: {'✅ Set' if BRAVE_API_KEY else '❌ Missing'}")
\ No newline at end of file
+    return get_plugin(server_id) or {}
+
+
+def print_config_summary():
+    """Print the loaded configuration and enabled servers"""
+    settings = _load()
+    # Collect the summary and write it in one go rather than line by line
+    lines = ["✅ Configuration loaded:"]
+    try:
+        enabled_servers = get_enabled_servers()
+        lines.append(f"   - Enabled MCP Servers: {len(enabled_servers)}")
+        lines.extend(
+            f"     • {config.get('icon', '❓')} {config.get('name', server_id)} ({server_id})"
+            for server_id, config in enabled_servers.items()
+        )
+    except Exception as e:
+        lines.append(f"   - MCP Servers: Plugin manager not yet available ({e})")
+    lines.append(f"   - OpenAI API Key: {'✅ Set' if settings['OPENAI_API_KEY'] else '❌ Missing'}")
+    lines.append(f"   - Brave API Key: {'✅ Set' if settings['BRAVE_API_KEY'] else '❌ Missing'}")
+    print("\n".join(lines))
+
+
+if __name__ == "__main__":
+    print_config_summary()
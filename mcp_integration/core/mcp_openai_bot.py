@@ -4,29 +4,37 @@ This version works with server selection and uses docker exec to avoid asyncio i
 """
 import asyncio
 import json
+import logging
+from collections.abc import AsyncIterator
 from datetime import datetime
 
 import openai
-from .config import OPENAI_API_KEY
+
+from . import config
 from .multi_client import MultiMCPClient
 
+logger = logging.getLogger(__name__)
+
 
 class MCPOpenAIBot:
     """OpenAI bot with MCP multi-server tools"""
     
     def __init__(self, selected_server: str = "filesystem", mcp_client: MultiMCPClient | None = None):
-        # Initialize OpenAI client
-        self.client = openai.OpenAI(api_key=OPENAI_API_KEY)
+        # Async OpenAI client, created on first use in the running event loop
+        self._client: openai.AsyncOpenAI | None = None
+        self._client_loop: asyncio.AbstractEventLoop | None = None
         
         # Set up MCP server selection
         self.selected_server = selected_server
         self.mcp_client = mcp_client or MultiMCPClient()
         self._owns_mcp_client = mcp_client is None  # Track if we created the client
         self.mcp_ready = False
+        self._openai_tools: list[dict] | None = None
+        self._system_prompt_cache: tuple[tuple, str] | None = None
         
     async def initialize(self):
         """Initialize MCP connection"""
-        print("🤖 Initializing MCP OpenAI Bot...")
+        logger.info("Initializing MCP OpenAI Bot")
         
         # Initialize MCP client only if we created it (not if it was provided)
         if self._owns_mcp_client:
@@ -35,13 +43,22 @@ class MCPOpenAIBot:
             # Use existing initialized client
             self.mcp_ready = True
         
+        self._openai_tools = None
+        
         if self.mcp_ready:
             available_servers = self.mcp_client.get_available_servers()
-            total_tools = sum(len(info['tools']) for info in available_servers.values())
-            print(f"✅ Bot ready with {len(available_servers)} servers and {total_tools} total MCP tools")
+            
+            # One pass: count tools for the status log and build the selected server's schema
+            total_tools = 0
+            for server_id, info in available_servers.items():
+                total_tools += len(info['tools'])
+                if server_id == self.selected_server:
+                    self.refresh_tools()
+            
+            logger.info("Bot ready with %d servers and %d total MCP tools", len(available_servers), total_tools)
             return True
         else:
-            print("❌ Bot initialization failed - MCP not available")
+            logger.warning("Bot initialization failed - MCP not available")
             return False
     
     def get_available_tools(self):
@@ -50,64 +67,78 @@ class MCPOpenAIBot:
             return {}
         return self.mcp_client.get_server_tools(self.selected_server)
     
-    def _create_openai_tools(self):
-        """Convert MCP tools to OpenAI function format"""
-        # Convert MCP tools to OpenAI format
-        mcp_tools = self.get_available_tools()
-        openai_tools = []
+    @property
+    def client(self) -> openai.AsyncOpenAI:
+        """OpenAI client bound to the running event loop"""
+        # Pooled HTTP connections belong to one loop; Streamlit reruns each use a new loop
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop:
+            self._client = openai.AsyncOpenAI(api_key=config.OPENAI_API_KEY)
+            self._client_loop = loop
+        return self._client
+    
+    def refresh_tools(self):
+        """Rebuild the cached OpenAI tool schema, e.g. after the MCP tool set changes"""
+        self._openai_tools = self._create_openai_tools() if self.mcp_ready else None
+    
+    @staticmethod
+    def _param_schema(param_desc: str | dict) -> dict:
+        """Convert one MCP parameter description into an OpenAI property schema"""
+        if isinstance(param_desc, str):
+            # Old format: parameter is just a description string
+            return {"type": "string", "description": param_desc}
+        # New format: parameter is a schema object
+        return {"type": param_desc.get("type", "string"), "description": param_desc.get("description", "")}
+    
+    @classmethod
+    def _tool_schema(cls, tool_name: str, tool_info: dict) -> dict:
+        """Convert one MCP tool into an OpenAI function schema"""
+        parameters = tool_info.get("parameters")
+        if not isinstance(parameters, dict):
+            parameters = {}
         
-        for tool_name, tool_info in mcp_tools.items():
-            # Create OpenAI function schema
-            properties = {}
-            required = []
-            
-            # Handle both old and new format
-            if isinstance(tool_info.get("parameters"), dict):
-                for param_name, param_desc in tool_info["parameters"].items():
-                    if isinstance(param_desc, str):
-                        # Old format: parameter is just a description string
-                        is_required = "optional" not in param_desc.lower()
-                        properties[param_name] = {
-                            "type": "string",
-                            "description": param_desc
-                        }
-                        if is_required:
-                            required.append(param_name)
-                    elif isinstance(param_desc, dict):
-                        # New format: parameter is a schema object
-                        properties[param_name] = {
-                            "type": param_desc.get("type", "string"),
-                            "description": param_desc.get("description", "")
-                        }
-                        # For new format, we need to check the tool's required array
-                        # For now, assume all are required unless marked optional
-                        if "optional" not in param_desc.get("description", "").lower():
-                            required.append(param_name)
-            
-            function_def = {
-                "type": "function",
-                "function": {
-                    "name": tool_name,
-                    "description": tool_info["description"], 
-                    "parameters": {
-                        "type": "object",
-                        "properties": properties,
-                        "required": required
-                    }
+        properties = {
+            param_name: cls._param_schema(param_desc)
+            for param_name, param_desc in parameters.items()
+            if isinstance(param_desc, str | dict)
+        }
+        # Parameters are required unless their description marks them optional
+        required = [
+            param_name for param_name, schema in properties.items()
+            if "optional" not in schema["description"].lower()
+        ]
+        
+        return {
+            "type": "function",
+            "function": {
+                "name": tool_name,
+                "description": tool_info["description"], 
+                "parameters": {
+                    "type": "object",
+                    "properties": properties,
+                    "required": required
                 }
             }
-            openai_tools.append(function_def)
-            
-        return openai_tools
+        }
     
-    async def _execute_mcp_tool(self, tool_name: str, arguments: dict):
-        """Execute MCP tool and return result"""
+    def _create_openai_tools(self):
+        """Convert MCP tools to OpenAI function format"""
+        return [
+            self._tool_schema(tool_name, tool_info)
+            for tool_name, tool_info in self.get_available_tools().items()
+        ]
+    
+    async def _execute_mcp_tools(self, calls: list[tuple[str, dict]]) -> list[str]:
+        """Execute several MCP tools concurrently as one batch, returning results in order"""
         if not self.mcp_ready:
-            return "MCP tools are not available"
-        
-        # Call the MCP tool
-        result = await self.mcp_client.call_tool(self.selected_server, tool_name, arguments)
+            return ["MCP tools are not available"] * len(calls)
         
+        results = await self.mcp_client.call_tools(self.selected_server, calls)
+        return [self._format_tool_result(result) for result in results]
+    
+    @staticmethod
+    def _format_tool_result(result: dict) -> str:
+        """Extract the text the model should see from an MCP tool result"""
         if "error" in result:
             return f"Error: {result['error']}"
         elif "content" in result:
@@ -115,16 +146,19 @@ class MCPOpenAIBot:
         else:
             return str(result)
     
-    async def chat(self, user_message: str) -> str:
-        """Chat with the bot, which can use MCP tools"""
-        try:
-            # Get server information for dynamic system message
-            available_servers = self.mcp_client.get_available_servers()
-            server_info = available_servers.get(self.selected_server, {})
-            
-            # Create server-specific system message
-            if self.selected_server == "filesystem":
-                server_context = f"""You are an AI assistant with access to filesystem tools via MCP (Model Context Protocol).
+    def _system_prompt(self) -> str:
+        """Get the system prompt, cached so it stays a stable prefix for OpenAI prompt caching"""
+        cache_key = (self.selected_server, self.mcp_ready)
+        if self._system_prompt_cache is not None and self._system_prompt_cache[0] == cache_key:
+            return self._system_prompt_cache[1]
+        
+        # Get server information for dynamic system message
+        available_servers = self.mcp_client.get_available_servers()
+        server_info = available_servers.get(self.selected_server, {})
+        
+        # Create server-specific system message
+        if self.selected_server == "filesystem":
+            server_context = f"""You are an AI assistant with access to filesystem tools via MCP (Model Context Protocol).
 
 You can help users with:
 - Reading and writing files
@@ -137,8 +171,8 @@ You can help users with:
 The filesystem is mounted at /projects with these directories:
 - /projects/data - Read-only data files
 - /projects/mcp_data - Read-write working directory"""
-            elif self.selected_server == "brave_search":
-                server_context = f"""You are an AI assistant with access to Brave Search tools via MCP (Model Context Protocol).
+        elif self.selected_server == "brave_search":
+            server_context = f"""You are an AI assistant with access to Brave Search tools via MCP (Model Context Protocol).
 
 You can help users with:
 - Web search using Brave Search API
@@ -148,44 +182,76 @@ You can help users with:
 - Local business search
 
 When performing searches, always provide clear, formatted results with titles, URLs, and descriptions."""
-            else:
-                server_context = f"""You are an AI assistant with access to {server_info.get('name', 'MCP')} tools via MCP (Model Context Protocol).
+        else:
+            server_context = f"""You are an AI assistant with access to {server_info.get('name', 'MCP')} tools via MCP (Model Context Protocol).
 
 Server: {server_info.get('name', 'Unknown')}
 Description: {server_info.get('description', 'No description available')}"""
+        
+        system_prompt = f"""{server_context}
 
-            # Prepare messages
-            messages = [
-                {
-                    "role": "system", 
-                    "content": f"""{server_context}
-                    
-Current time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+The current time is given at the start of each user message.
 
 Be helpful and explain what you're doing when using tools.
 MCP Status: {'Available' if self.mcp_ready else 'Unavailable'}
 Selected Server: {server_info.get('name', self.selected_server)}
 """
-                },
-                {"role": "user", "content": user_message}
-            ]
-            
-            # Prepare tools if MCP is ready
-            tools = self._create_openai_tools() if self.mcp_ready else None
-            
-            # Call OpenAI
-            kwargs = {
-                "model": "gpt-4",
-                "messages": messages,
-                "temperature": 0.7,
-                "max_tokens": 1000
+        self._system_prompt_cache = (cache_key, system_prompt)
+        return system_prompt
+    
+    def _completion_kwargs(self, messages: list, with_tools: bool = False) -> dict:
+        """Build the arguments for an OpenAI chat completion request"""
+        kwargs = {
+            "model": "gpt-4",
+            "messages": messages,
+            "temperature": 0.7,
+            "max_tokens": 1000
+        }
+        
+        # Tool schema is built once in initialize(); MCP tools don't change per message
+        tools = self._openai_tools
+        if with_tools and tools:
+            kwargs["tools"] = tools
+            kwargs["tool_choice"] = "auto"
+        return kwargs
+    
+    def _initial_messages(self, user_message: str) -> list:
+        """Start a conversation with the cached system prompt and a timestamped user turn"""
+        # The timestamp goes in the user turn so the system prompt prefix never changes
+        return [
+            {"role": "system", "content": self._system_prompt()},
+            {
+                "role": "user",
+                "content": f"[Current time: {datetime.now().strftime('%Y-%m-%d %H:%M')}]\n{user_message}"
             }
+        ]
+    
+    async def _append_tool_results(self, messages: list, calls: list[tuple[str, str, dict]]) -> None:
+        """Execute (call_id, tool_name, arguments) tool calls and append their results to messages"""
+        for _, tool_name, arguments in calls:
+            logger.debug("Executing: %s(%s)", tool_name, arguments)
+        
+        # Tool calls are independent, so run them together rather than one by one
+        tool_results = await self._execute_mcp_tools(
+            [(tool_name, arguments) for _, tool_name, arguments in calls]
+        )
+        
+        for (call_id, _, _), tool_result in zip(calls, tool_results):
+            messages.append({
+                "role": "tool",
+                "tool_call_id": call_id,
+                "content": str(tool_result)
+            })
+    
+    async def chat(self, user_message: str) -> str:
+        """Chat with the bot, which can use MCP tools"""
+        try:
+            messages = self._initial_messages(user_message)
             
-            if tools:
-                kwargs["tools"] = tools
-                kwargs["tool_choice"] = "auto"
-            
-            response = self.client.chat.completions.create(**kwargs)
+            # Call OpenAI
+            response = await self.client.chat.completions.create(
+                **self._completion_kwargs(messages, with_tools=True)
+            )
             
             # Handle tool calls
             message = response.choices[0].message
@@ -194,26 +260,19 @@ Selected Server: {server_info.get('name', self.selected_server)}
                 # Execute tool calls
                 messages.append(message)
                 
+                calls = []
                 for tool_call in message.tool_calls:
-                    tool_name = tool_call.function.name
-                    arguments = json.loads(tool_call.function.arguments)  # Parse JSON properly
-                    
-                    print(f"🔧 Executing: {tool_name}({arguments})")
-                    
-                    tool_result = await self._execute_mcp_tool(tool_name, arguments)
-                    
-                    messages.append({
-                        "role": "tool",
-                        "tool_call_id": tool_call.id,
-                        "content": str(tool_result)
-                    })
+                    # Parsed-completion responses already carry decoded arguments
+                    arguments = getattr(tool_call.function, "parsed_arguments", None)
+                    if arguments is None:
+                        arguments = json.loads(tool_call.function.arguments)  # Parse JSON properly
+                    calls.append((tool_call.id, tool_call.function.name, arguments))
+                
+                await self._append_tool_results(messages, calls)
                 
                 # Get final response with tool results
-                final_response = self.client.chat.completions.create(
-                    model="gpt-4",
-                    messages=messages,
-                    temperature=0.7,
-                    max_tokens=1000
+                final_response = await self.client.chat.completions.create(
+                    **self._completion_kwargs(messages)
                 )
                 
                 return final_response.choices[0].message.content
@@ -223,6 +282,65 @@ Selected Server: {server_info.get('name', self.selected_server)}
         except Exception as e:
             return f"Error: {e}"
     
+    async def stream_chat(self, user_message: str) -> AsyncIterator[str]:
+        """Chat with the bot like chat(), yielding reply text chunks as OpenAI streams them"""
+        try:
+            messages = self._initial_messages(user_message)
+            
+            stream = await self.client.chat.completions.create(
+                **self._completion_kwargs(messages, with_tools=True), stream=True
+            )
+            
+            # Tool calls arrive as fragments keyed by index; stitch them back together
+            content_parts = []
+            tool_calls: dict[int, dict] = {}
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta
+                if delta.content:
+                    content_parts.append(delta.content)
+                    yield delta.content
+                for call_delta in delta.tool_calls or ():
+                    call = tool_calls.setdefault(call_delta.index, {"id": "", "name": "", "arguments": ""})
+                    if call_delta.id:
+                        call["id"] = call_delta.id
+                    if call_delta.function is not None:
+                        call["name"] += call_delta.function.name or ""
+                        call["arguments"] += call_delta.function.arguments or ""
+            
+            if not tool_calls:
+                return
+            
+            ordered_calls = [tool_calls[index] for index in sorted(tool_calls)]
+            messages.append({
+                "role": "assistant",
+                "content": "".join(content_parts) or None,
+                "tool_calls": [
+                    {
+                        "id": call["id"],
+                        "type": "function",
+                        "function": {"name": call["name"], "arguments": call["arguments"]}
+                    }
+                    for call in ordered_calls
+                ]
+            })
+            await self._append_tool_results(messages, [
+                (call["id"], call["name"], json.loads(call["arguments"] or "{}"))
+                for call in ordered_calls
+            ])
+            
+            # Stream the final response with tool results
+            final_stream = await self.client.chat.completions.create(
+                **self._completion_kwargs(messages), stream=True
+            )
+            async for chunk in final_stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+                    
+        except Exception as e:
+            yield f"Error: {e}"
+    
     async def close(self):
         """Close MCP connection if we own it"""
         if self.mcp_client and self._owns_mcp_client:
@@ -297,7 +415,12 @@ async def interactive_chat():
 if __name__ == "__main__":
     import sys
     
+    try:
+        from utils.event_loop import run_event_loop
+    except ImportError:
+        run_event_loop = asyncio.run
+    
     if len(sys.argv) > 1 and sys.argv[1] == "test":
-        asyncio.run(test_mcp_bot())
+        run_event_loop(test_mcp_bot())
     else:
-        asyncio.run(interactive_chat())
\ No newline at end of file
+        run_event_loop(interactive_chat())
\ No newline at end of file
@@ -2,51 +2,104 @@
 Multi-server MCP Client that can manage multiple MCP servers.
 This replaces the single working_mcp_client with a flexible multi-server approach.
 """
+import asyncio
+import logging
+import os
+from collections.abc import Mapping
+from contextlib import AsyncExitStack
+from types import MappingProxyType
 from typing import Any
 
 from .plugin_manager import load_plugins
 
+logger = logging.getLogger(__name__)
+
+# Cap on concurrent tool calls per server, so bursts don't pile up docker exec processes
+MCP_MAX_INFLIGHT = int(os.getenv("MCP_MAX_INFLIGHT", "8"))
+
 
 class MCPServerClient:
     """Individual MCP server client"""
     
-    def __init__(self, server_id: str, config: dict[str, Any], client_class: type):
+    def __init__(self, server_id: str, config: dict[str, Any], client_class: type, max_concurrent: int = MCP_MAX_INFLIGHT):
         self.server_id = server_id
         self.config = config
         self.container_name = config.get("container_name")
         self.server_path = config.get("server_path")
-        self.working_client = client_class(config)
+        self._client_class = client_class
+        self.working_client = None
         self.is_initialized = False
+        self._tools: Mapping[str, dict[str, Any]] | None = None
+        # Tools declared in the plugin config, used until a working client provides its own
+        self._config_tools: Mapping[str, dict[str, Any]] = config.get("tools", {})
+        self._tool_names: tuple[str, ...] | None = None
+        self.max_concurrent = max_concurrent
+        self._sem: asyncio.Semaphore | None = None
+        self._sem_loop: asyncio.AbstractEventLoop | None = None
         
     async def initialize(self) -> bool:
         """Initialize connection to MCP container"""
         try:
-            print(f"🔄 Initializing {self.config['name']}...")
-            print(f"   Container: {self.container_name}")
+            logger.info("🔄 Initializing %s (container: %s)", self.config['name'], self.container_name)
+            
+            # Construct the working client only once the server is actually brought up
+            if self.working_client is None and self._client_class is not None:
+                self.working_client = self._client_class(self.config)
+                self.invalidate_tools()
             
             # Use the working client's initialization
             if self.working_client:
                 success = await self.working_client.initialize()
                 if success:
-                    print(f"✅ {self.config['name']} connection successful")
+                    logger.info("✅ %s connection successful", self.config['name'])
+                    # Snapshot the tool listing once; it is read many times per UI rerun
+                    self._tools = MappingProxyType(dict(self.working_client.get_available_tools()))
+                    self._tool_names = None
                     self.is_initialized = True
                     return True
                 else:
-                    print(f"❌ {self.config['name']} connection failed")
+                    logger.warning("❌ %s connection failed", self.config['name'])
                     return False
             else:
-                print(f"❌ No working client available for {self.config['name']}")
+                logger.warning("❌ No working client available for %s", self.config['name'])
                 return False
                 
         except Exception as e:
-            print(f"❌ {self.config['name']} initialization failed: {e}")
+            logger.error("❌ %s initialization failed: %s", self.config['name'], e)
             return False
     
-    def get_available_tools(self) -> dict[str, dict[str, Any]]:
+    def get_available_tools(self) -> Mapping[str, dict[str, Any]]:
         """Get tools available for this server"""
+        if self._tools is not None:
+            return self._tools
         if self.working_client:
             return self.working_client.get_available_tools()
-        return self.config.get("tools", {})
+        return self._config_tools
+    
+    def invalidate_tools(self):
+        """Drop the cached tool listing so the next lookup asks the working client again"""
+        self._tools = None
+        self._tool_names = None
+    
+    def get_tool_names(self) -> tuple[str, ...]:
+        """Get tool names for this server; the tool set is fixed per client"""
+        if self._tool_names is None:
+            self._tool_names = tuple(self.get_available_tools().keys())
+        return self._tool_names
+    
+    def _call_slots(self) -> asyncio.Semaphore:
+        """Get the concurrency limiter for the running event loop"""
+        # Streamlit reruns use a fresh loop, and a semaphore cannot be shared across loops
+        loop = asyncio.get_running_loop()
+        if self._sem_loop is not loop:
+            self._sem = asyncio.Semaphore(self.max_concurrent)
+            self._sem_loop = loop
+        return self._sem
+    
+    async def _call_limited(self, tool_name: str, arguments: dict[str, Any]) -> dict[str, Any]:
+        """Run a single working-client tool call inside the concurrency limit"""
+        async with self._call_slots():
+            return await self.working_client.call_tool(tool_name, arguments)
     
     async def call_tool(self, tool_name: str, arguments: dict[str, Any]) -> dict[str, Any]:
         """Execute MCP tool via working clients"""
@@ -61,10 +114,49 @@ class MCPServerClient:
             return {"error": f"Unknown tool '{tool_name}' for {self.config['name']}"}
         
         try:
-            return await self.working_client.call_tool(tool_name, arguments)
+            return await self._call_limited(tool_name, arguments)
         except Exception as e:
             return {"error": f"Tool execution failed: {str(e)}"}
     
+    async def call_tools_batch(self, calls: list[tuple[str, dict[str, Any]]]) -> list[dict[str, Any]]:
+        """Execute several tools on this server, in one round trip where the client supports it"""
+        if not self.is_initialized:
+            return [{"error": f"{self.config['name']} not initialized"}] * len(calls)
+        
+        if not self.working_client:
+            return [{"error": f"No working client available for {self.config['name']}"}] * len(calls)
+        
+        available_tools = self.get_available_tools()
+        results: list[dict[str, Any] | None] = [None] * len(calls)
+        valid = []
+        for index, (tool_name, _) in enumerate(calls):
+            if tool_name in available_tools:
+                valid.append(index)
+            else:
+                results[index] = {"error": f"Unknown tool '{tool_name}' for {self.config['name']}"}
+        
+        if valid:
+            batch = getattr(self.working_client, "call_tools_batch", None)
+            # Clients that would split the batch into separate requests get one slot per call instead
+            if batch is not None and getattr(self.working_client, "supports_batch", True):
+                try:
+                    # A batch is a single request to the server, so it takes one slot
+                    async with self._call_slots():
+                        outcomes = await batch([calls[i] for i in valid])
+                except Exception as e:
+                    outcomes = [e] * len(valid)
+            else:
+                outcomes = await asyncio.gather(
+                    *(self._call_limited(*calls[i]) for i in valid),
+                    return_exceptions=True
+                )
+            for index, outcome in zip(valid, outcomes):
+                if isinstance(outcome, BaseException):
+                    outcome = {"error": f"Tool execution failed: {str(outcome)}"}
+                results[index] = outcome
+        
+        return results
+    
     async def close(self):
         """Close the working client connection"""
         if self.working_client:
@@ -74,61 +166,106 @@ class MCPServerClient:
 class MultiMCPClient:
     """Multi-server MCP client that manages multiple MCP servers"""
     
-    def __init__(self):
+    def __init__(self, max_concurrent: int = MCP_MAX_INFLIGHT):
+        # Cap on in-flight tool calls to each server
+        self.max_concurrent = max_concurrent
         self.servers: dict[str, MCPServerClient] = {}
+        # Enabled servers that did not come up, with the same summary fields as get_available_servers()
+        self.failed_servers: dict[str, dict[str, Any]] = {}
         self.is_initialized = False
+        self._servers_snapshot: dict[str, dict[str, Any]] | None = None
+        # Owns every server client started by initialize(); close() unwinds it
+        self._exit_stack = AsyncExitStack()
         
     async def initialize(self) -> bool:
         """Initialize all enabled MCP servers"""
         try:
-            print("🔄 Initializing Multi-MCP Client...")
+            logger.info("🔄 Initializing Multi-MCP Client...")
             
             plugins = load_plugins()
             if not plugins:
-                print("⚠️ No plugins found")
+                logger.warning("⚠️ No plugins found")
                 return False
             
-            # Initialize each enabled plugin
+            # Build a client for each enabled plugin
+            candidates: list[MCPServerClient] = []
             for server_id, config in plugins.items():
                 if not config.get("enabled"):
-                    print(f"⏭️ Skipping disabled plugin: {server_id}")
+                    logger.info("⏭️ Skipping disabled plugin: %s", server_id)
                     continue
                 
                 client_class = config["client_class"]
-                server_client = MCPServerClient(server_id, config, client_class)
+                candidates.append(MCPServerClient(server_id, config, client_class, self.max_concurrent))
+            
+            # Registered before startup so processes are reaped even if initialization is interrupted
+            self._exit_stack.push_async_callback(self._close_servers, candidates)
+            
+            async def initialize_server(server_client: MCPServerClient) -> bool:
+                name = server_client.config.get("name", server_client.server_id)
                 success = await server_client.initialize()
-                
                 if success:
-                    self.servers[server_id] = server_client
-                    print(f"✅ {config.get('name', server_id)} ready")
+                    logger.info("✅ %s ready", name)
+                else:
+                    logger.warning("❌ %s failed to initialize", name)
+                return success
+            
+            # Servers start independently, so bring them up concurrently
+            results = await asyncio.gather(
+                *(initialize_server(server_client) for server_client in candidates),
+                return_exceptions=True
+            )
+            failed = []
+            for server_client, success in zip(candidates, results):
+                if success is True:
+                    self.servers[server_client.server_id] = server_client
+                    self.failed_servers.pop(server_client.server_id, None)
                 else:
-                    print(f"❌ {config.get('name', server_id)} failed to initialize")
+                    failed.append(server_client)
+                    self.failed_servers[server_client.server_id] = {
+                        "name": server_client.config.get("name", server_client.server_id),
+                        "description": server_client.config.get("description", ""),
+                        "icon": server_client.config.get("icon", "🔧"),
+                    }
+            
+            # A failed probe can still leave a process behind (e.g. a persistent shell)
+            if failed:
+                await asyncio.gather(
+                    *(server_client.close() for server_client in failed),
+                    return_exceptions=True
+                )
+            
+            # Build the server summary once here; UI reruns then just read it
+            self._servers_snapshot = None
+            self.get_available_servers()
             
             if self.servers:
-                print(f"✅ Multi-MCP Client initialized with {len(self.servers)} servers")
+                logger.info("✅ Multi-MCP Client initialized with %d servers", len(self.servers))
                 self.is_initialized = True
                 return True
             else:
-                print("❌ No MCP servers successfully initialized")
+                logger.warning("❌ No MCP servers successfully initialized")
                 return False
                 
         except Exception as e:
-            print(f"❌ Multi-MCP Client initialization failed: {e}")
+            logger.error("❌ Multi-MCP Client initialization failed: %s", e)
             return False
     
     def get_available_servers(self) -> dict[str, dict[str, Any]]:
         """Get all available/initialized servers"""
-        return {
-            server_id: {
-                "name": server.config["name"],
-                "description": server.config["description"], 
-                "icon": server.config["icon"],
-                "tools": list(server.get_available_tools().keys())
+        # Rebuilt only when the set of servers changes
+        if self._servers_snapshot is None:
+            self._servers_snapshot = {
+                server_id: {
+                    "name": server.config["name"],
+                    "description": server.config.get("description", ""), 
+                    "icon": server.config.get("icon", "🔧"),
+                    "tools": server.get_tool_names()
+                }
+                for server_id, server in self.servers.items()
             }
-            for server_id, server in self.servers.items()
-        }
+        return self._servers_snapshot
     
-    def get_server_tools(self, server_id: str) -> dict[str, dict[str, Any]]:
+    def get_server_tools(self, server_id: str) -> Mapping[str, dict[str, Any]]:
         """Get tools available for a specific server"""
         if server_id in self.servers:
             return self.servers[server_id].get_available_tools()
@@ -136,16 +273,56 @@ class MultiMCPClient:
     
     async def call_tool(self, server_id: str, tool_name: str, arguments: dict[str, Any]) -> dict[str, Any]:
         """Execute tool on specific server"""
-        if not self.is_initialized:
-            return {"error": "Multi-MCP Client not initialized"}
+        results = await self.call_tools_batch([(server_id, tool_name, arguments)])
+        return results[0]
+    
+    async def call_tools_batch(self, calls: list[tuple[str, str, dict[str, Any]]]) -> list[dict[str, Any]]:
+        """Execute several tool calls, sending one batch per server with servers in parallel"""
+        results: list[dict[str, Any] | None] = [None] * len(calls)
+        buckets: dict[str, list[tuple[int, str, dict[str, Any]]]] = {}
+        for index, (server_id, tool_name, arguments) in enumerate(calls):
+            buckets.setdefault(server_id, []).append((index, tool_name, arguments))
         
-        if server_id not in self.servers:
-            available = list(self.servers.keys())
-            return {"error": f"Server '{server_id}' not available. Available servers: {available}"}
+        async def run_bucket(server_id: str, items: list[tuple[int, str, dict[str, Any]]]):
+            if not self.is_initialized:
+                server_results = [{"error": "Multi-MCP Client not initialized"}] * len(items)
+            elif server_id not in self.servers:
+                available = list(self.servers.keys())
+                error = f"Server '{server_id}' not available. Available servers: {available}"
+                server_results = [{"error": error}] * len(items)
+            elif len(items) == 1:
+                _, tool_name, arguments = items[0]
+                server_results = [await self.servers[server_id].call_tool(tool_name, arguments)]
+            else:
+                server_results = await self.servers[server_id].call_tools_batch(
+                    [(tool_name, arguments) for _, tool_name, arguments in items]
+                )
+            for (index, _, _), result in zip(items, server_results):
+                results[index] = result
         
-        return await self.servers[server_id].call_tool(tool_name, arguments)
+        await asyncio.gather(*(run_bucket(sid, items) for sid, items in buckets.items()))
+        return results
+    
+    async def call_tools(self, server_id: str, calls: list[tuple[str, dict[str, Any]]]) -> list[dict[str, Any]]:
+        """Execute several (tool_name, arguments) calls on one server concurrently, returning results in order"""
+        return await self.call_tools_batch(
+            [(server_id, tool_name, arguments) for tool_name, arguments in calls]
+        )
+    
+    @staticmethod
+    async def _close_servers(server_clients: list[MCPServerClient]):
+        """Close server clients concurrently, logging rather than raising failures"""
+        results = await asyncio.gather(
+            *(server_client.close() for server_client in server_clients),
+            return_exceptions=True
+        )
+        for server_client, result in zip(server_clients, results):
+            if isinstance(result, Exception):
+                logger.warning("⚠️ Failed to close %s: %s", server_client.server_id, result)
     
     async def close(self):
         """Clean up resources"""
-        for server in self.servers.values():
-            await server.close()
\ No newline at end of file
+        exit_stack, self._exit_stack = self._exit_stack, AsyncExitStack()
+        await exit_stack.aclose()
+        self._servers_snapshot = None
+        self.failed_servers = {}
@@ -2,16 +2,182 @@
 Plugin manager for MCP integration.
 Dynamically discovers and loads plugin configurations and their corresponding client classes.
 """
-from pathlib import Path
-import yaml
+import functools
 import importlib
+import json
 import logging
-from typing import Dict, Any, Optional
+import os
+import sys
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any
+
+import yaml
+
+# Prefer the libyaml C parser when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+logger = logging.getLogger(__name__)
+
+# Global cache for loaded plugins; configs are read-only views shared by every caller
+_PLUGINS: dict[str, Mapping[str, Any]] | None = None
+
+# Cached subset of _PLUGINS that are enabled
+_ENABLED_PLUGINS: dict[str, Mapping[str, Any]] | None = None
+
+# Bumped whenever _PLUGINS is rebuilt; keys caches derived from the plugin set
+_SNAPSHOT = 0
+
+# Directory names that are never plugins (caches, VCS metadata, vendored packages)
+_SKIP_DIRS = frozenset({
+    "__pycache__", "__pypackages__", "node_modules",
+    ".git", ".hg", ".svn", ".cache", ".mypy_cache", ".pytest_cache",
+})
+
+# On-disk manifest of discovered plugins, reused while no config.yaml has changed
+_MANIFEST_FILE_NAME = ".plugin_cache.json"
+
+
+@functools.cache
+def _cached_import(module_name: str, class_name: str) -> type:
+    """Import a class, skipping the import machinery when its module is already loaded"""
+    module = sys.modules.get(module_name)
+    if module is None:
+        module = importlib.import_module(module_name)
+    return getattr(module, class_name)
+
+
+def _iter_plugin_dirs(plugins_dir: Path):
+    """Yield directory entries for plugins, using scandir's cached file types"""
+    with os.scandir(plugins_dir) as it:
+        for entry in it:
+            if entry.name.startswith('.') or entry.name in _SKIP_DIRS:
+                continue
+            if entry.is_dir():
+                yield entry
+
+
+def _plugins_signature(plugins_dir: Path) -> dict[str, int | None]:
+    """
+    Snapshot the config.yaml modification time of every plugin directory.
+    Directories without a config.yaml are recorded as None so adding one is noticed.
+    """
+    signature = {}
+    for entry in _iter_plugin_dirs(plugins_dir):
+        try:
+            signature[entry.name] = os.stat(os.path.join(entry.path, "config.yaml")).st_mtime_ns
+        except FileNotFoundError:
+            signature[entry.name] = None
+    return signature
+
+
+def _read_manifest(manifest_file: Path, signature: dict[str, int | None]) -> list | None:
+    """Return the cached plugin entries if the manifest matches the current signature"""
+    try:
+        manifest = json.loads(manifest_file.read_text())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(manifest, dict) or manifest.get("signature") != signature:
+        return None
+    return manifest.get("entries")
+
+
+def _write_manifest(manifest_file: Path, signature: dict[str, int | None], entries: list) -> None:
+    """Persist discovered plugin entries; failures only cost the next cold start"""
+    tmp_file = manifest_file.with_name(manifest_file.name + ".tmp")
+    try:
+        tmp_file.write_text(json.dumps({"signature": signature, "entries": entries}))
+        os.replace(tmp_file, manifest_file)
+    except (OSError, TypeError, ValueError) as e:
+        logger.debug("Could not write plugin manifest %s: %s", manifest_file, e)
+
+
+def _parallel_map(func, items: list) -> list:
+    """Map func over items on a thread pool; plugin work is mostly file I/O and imports"""
+    if len(items) <= 1:
+        return [func(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(32, len(items))) as executor:
+        return list(executor.map(func, items))
+
+
+def _discover_plugin(plugin_entry: os.DirEntry) -> dict[str, Any] | None:
+    """
+    Parse one plugin's config.yaml and resolve the dotted path of its client class.
+    
+    Returns:
+        {"server_id", "config", "client_class"} entry, or None if the plugin is unusable
+    """
+    try:
+        # Opening directly doubles as the existence check
+        try:
+            with open(os.path.join(plugin_entry.path, "config.yaml"), "rb") as config_file:
+                raw_config = config_file.read()
+        except FileNotFoundError:
+            logger.warning("No config.yaml found in plugin %s", plugin_entry.name)
+            return None
 
-# Global cache for loaded plugins
-_PLUGINS: Optional[Dict[str, Dict[str, Any]]] = None
+        # Load YAML configuration
+        try:
+            config = yaml.load(raw_config, Loader=_YamlLoader)
+            if not config:
+                logger.warning("Empty config.yaml in plugin %s", plugin_entry.name)
+                return None
+        except yaml.YAMLError as e:
+            logger.error("Invalid YAML in plugin %s: %s", plugin_entry.name, e)
+            return None
 
-def load_plugins() -> Dict[str, Dict[str, Any]]:
+        server_id = plugin_entry.name
+
+        # Resolve client class path
+        client_path = config.get("client_class", None)
+        if not client_path:
+            # Fallback: use naming convention
+            client_path = f"mcp_integration.clients.{server_id}_client.{server_id.title().replace('_', '')}Client"
+            logger.info("Using naming convention for %s: %s", server_id, client_path)
+
+        return {"server_id": server_id, "config": config, "client_class": client_path}
+
+    except Exception:
+        logger.exception("Error loading plugin %s", plugin_entry.name)
+        return None
+
+
+def _discover_plugins(plugins_dir: Path) -> list:
+    """
+    Parse every plugin's config.yaml in parallel.
+    
+    Returns:
+        List of {"server_id", "config", "client_class"} entries, JSON-serializable
+    """
+    plugin_entries = list(_iter_plugin_dirs(plugins_dir))
+    return [entry for entry in _parallel_map(_discover_plugin, plugin_entries) if entry is not None]
+
+
+def _load_plugin(entry: dict[str, Any]) -> Mapping[str, Any] | None:
+    """Import the client class for a discovered plugin and build its runtime config"""
+    server_id = entry["server_id"]
+    config = dict(entry["config"])
+
+    # Load client class
+    try:
+        module_name, class_name = entry["client_class"].rsplit(".", 1)
+        client_class = _cached_import(module_name, class_name)
+    except (ImportError, AttributeError, ValueError) as e:
+        logger.error("Cannot load client class for %s: %s", server_id, e)
+        return None
+
+    # Add resolved client class and server_id to config
+    config["client_class"] = client_class
+    config["server_id"] = sys.intern(server_id)
+    return MappingProxyType(config)
+
+
+def load_plugins() -> dict[str, Mapping[str, Any]]:
     """
     Discover and load all plugins. Returns a dictionary keyed by server_id.
     Each plugin config includes a reference to its client class.
@@ -19,75 +185,50 @@ def load_plugins() -> Dict[str, Dict[str, Any]]:
     Returns:
         Dict mapping server_id to plugin configuration with client_class loaded
     """
-    global _PLUGINS
+    global _PLUGINS, _SNAPSHOT
     if _PLUGINS is not None:
         return _PLUGINS
+    _SNAPSHOT += 1
 
     plugins_dir = Path(__file__).parent.parent / "plugins"
     plugins = {}
 
     if not plugins_dir.exists():
-        print(f"⚠️ Warning: Plugins directory not found at {plugins_dir}")
+        logger.warning("Plugins directory not found at %s", plugins_dir)
         _PLUGINS = {}
         return _PLUGINS
 
-    for plugin_path in plugins_dir.iterdir():
-        if plugin_path.is_dir() and not plugin_path.name.startswith('.'):
-            try:
-                config_file = plugin_path / "config.yaml"
-                if not config_file.exists():
-                    print(f"⚠️ Warning: No config.yaml found in plugin {plugin_path.name}")
-                    continue
-
-                # Load YAML configuration
-                try:
-                    config = yaml.safe_load(config_file.read_text())
-                    if not config:
-                        print(f"⚠️ Warning: Empty config.yaml in plugin {plugin_path.name}")
-                        continue
-                except yaml.YAMLError as e:
-                    print(f"❌ Error: Invalid YAML in plugin {plugin_path.name}: {e}")
-                    continue
-
-                server_id = plugin_path.name
-
-                # Load client class
-                client_path = config.get("client_class", None)
-                try:
-                    if client_path:
-                        # Use explicit client_class from config
-                        module_name, class_name = client_path.rsplit(".", 1)
-                        module = importlib.import_module(module_name)
-                        client_class = getattr(module, class_name)
-                    else:
-                        # Fallback: use naming convention
-                        module_name = f"mcp_integration.clients.{server_id}_client"
-                        class_name = f"{server_id.title().replace('_', '')}Client"
-                        module = importlib.import_module(module_name)
-                        client_class = getattr(module, class_name)
-                        print(f"ℹ️ Using naming convention for {server_id}: {module_name}.{class_name}")
-
-                except (ImportError, AttributeError) as e:
-                    print(f"❌ Error: Cannot load client class for {server_id}: {e}")
-                    continue
-
-                # Add resolved client class and server_id to config
-                config["client_class"] = client_class
-                config["server_id"] = server_id
-                plugins[server_id] = config
-
-                print(f"✅ Loaded plugin: {config.get('name', server_id)} ({server_id})")
-
-            except Exception as e:
-                print(f"❌ Error loading plugin {plugin_path.name}: {e}")
-                continue
+    # Warm starts skip YAML parsing when no plugin config has changed since the last scan
+    manifest_file = plugins_dir / _MANIFEST_FILE_NAME
+    signature = _plugins_signature(plugins_dir)
+    entries = _read_manifest(manifest_file, signature)
+    if entries is None:
+        entries = _discover_plugins(plugins_dir)
+        _write_manifest(manifest_file, signature, entries)
+
+    for config in _parallel_map(_load_plugin, entries):
+        if config is None:
+            continue
+        server_id = config["server_id"]
+        plugins[server_id] = config
+
+        logger.info("Loaded plugin: %s (%s)", config.get('name', server_id), server_id)
 
     _PLUGINS = plugins
-    print(f"🔌 Plugin manager loaded {len(plugins)} plugins")
+    logger.info("Plugin manager loaded %d plugins", len(plugins))
     return plugins
 
 
-def reload_plugins() -> Dict[str, Dict[str, Any]]:
+def invalidate_plugins() -> None:
+    """
+    Clear the plugin caches so the next lookup rediscovers plugins from disk.
+    """
+    global _PLUGINS, _ENABLED_PLUGINS
+    _PLUGINS = None
+    _ENABLED_PLUGINS = None
+
+
+def reload_plugins() -> dict[str, Mapping[str, Any]]:
     """
     Force reload of all plugins, clearing the cache.
     Useful for development or when plugin configurations change.
@@ -95,12 +236,28 @@ def reload_plugins() -> Dict[str, Dict[str, Any]]:
     Returns:
         Dict mapping server_id to plugin configuration with client_class loaded
     """
-    global _PLUGINS
-    _PLUGINS = None
+    invalidate_plugins()
     return load_plugins()
 
 
-def get_plugin(server_id: str) -> Optional[Dict[str, Any]]:
+def get_enabled_plugins() -> dict[str, Mapping[str, Any]]:
+    """
+    Get only the enabled plugins, cached until the plugins are invalidated.
+    
+    Returns:
+        Dict mapping server_id to plugin configuration for enabled plugins
+    """
+    global _ENABLED_PLUGINS
+    if _ENABLED_PLUGINS is None:
+        _ENABLED_PLUGINS = {
+            server_id: config
+            for server_id, config in load_plugins().items()
+            if config.get("enabled", False)
+        }
+    return _ENABLED_PLUGINS
+
+
+def get_plugin(server_id: str) -> Mapping[str, Any] | None:
     """
     Get a specific plugin by server_id.
     
@@ -114,15 +271,21 @@ def get_plugin(server_id: str) -> Optional[Dict[str, Any]]:
     return plugins.get(server_id)
 
 
-def list_available_plugins() -> Dict[str, str]:
+def list_available_plugins() -> dict[str, str]:
     """
     List all available plugins with their names.
     
     Returns:
         Dict mapping server_id to plugin name
     """
-    plugins = load_plugins()
+    load_plugins()
+    return _list_available_impl(_SNAPSHOT)
+
+
+@functools.lru_cache(maxsize=1)
+def _list_available_impl(snapshot: int) -> dict[str, str]:
+    """Build the server_id -> name listing once per plugin snapshot"""
     return {
         server_id: config.get("name", server_id) 
-        for server_id, config in plugins.items()
+        for server_id, config in _PLUGINS.items()
     }
\ No newline at end of file
@@ -4,6 +4,7 @@ Wrapper module to preserve compatibility with existing imports.
 This ensures that streamlit_app.py can continue using 'from mcp_tab import render_mcp_tab'
 """
 
-from ui.mcp_tab import render_mcp_tab, draw_mcp_messages, process_mcp_message
+from ui.mcp_tab import render_mcp_tab, draw_mcp_messages, draw_mcp_messages_sync, process_mcp_message, stream_mcp_message
+from utils.event_loop import run_event_loop
 
-__all__ = ["render_mcp_tab", "draw_mcp_messages", "process_mcp_message"]
+__all__ = ["render_mcp_tab", "draw_mcp_messages", "draw_mcp_messages_sync", "process_mcp_message", "stream_mcp_message", "run_event_loop"]
@@ -0,0 +1,73 @@
+"""
+Background event loop shared by every Streamlit session.
+MCP connections are bound to the loop that opened them, so they live on one
+long-running loop thread instead of the fresh loop each rerun starts.
+"""
+import asyncio
+import concurrent.futures
+import contextlib
+import os
+import threading
+from collections.abc import AsyncGenerator, AsyncIterator, Coroutine, Iterator
+from typing import Any, TypeVar
+
+import streamlit as st
+from utils.event_loop import new_event_loop
+
+T = TypeVar("T")
+
+# Seconds the Streamlit script thread waits on a single step before giving up on it
+MCP_UI_TIMEOUT = float(os.getenv("MCP_UI_TIMEOUT", "300"))
+
+# Marks the end of a generator being iterated from another loop
+_EXHAUSTED = object()
+
+
+async def _anext(agen: AsyncIterator[T]) -> Any:
+    """Fetch the next item, returning _EXHAUSTED rather than raising at the end"""
+    try:
+        return await agen.__anext__()
+    except StopAsyncIteration:
+        return _EXHAUSTED
+
+
+class AsyncLoopThread:
+    """An event loop running forever in a daemon thread"""
+
+    def __init__(self):
+        self.loop = new_event_loop()
+        self._thread = threading.Thread(target=self._run, name="mcp-event-loop", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def submit(self, coro: Coroutine[Any, Any, T]) -> concurrent.futures.Future[T]:
+        """Schedule a coroutine on the loop from any thread"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Coroutine[Any, Any, T], timeout: float | None = MCP_UI_TIMEOUT) -> T:
+        """Run a coroutine on the loop and block until it finishes, cancelling it after timeout"""
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            future.cancel()
+            raise
+
+    def iterate(self, agen: AsyncGenerator[T, None]) -> Iterator[T]:
+        """Drive an async generator on the loop, yielding its items to synchronous code"""
+        try:
+            while (item := self.run(_anext(agen))) is not _EXHAUSTED:
+                yield item
+        finally:
+            # A step cancelled by a timeout may still be unwinding the generator
+            with contextlib.suppress(RuntimeError):
+                self.run(agen.aclose())
+
+
+@st.cache_resource(show_spinner=False)
+def get_async_loop() -> AsyncLoopThread:
+    """Get the process-wide MCP event loop"""
+    return AsyncLoopThread()
@@ -3,51 +3,129 @@ MCP Tab for Streamlit UI - uses the multi-server MCP client
 Handles MCP server interactions with server selection interface
 """
 import asyncio
+import functools
+import itertools
+import logging
 import sys
+import time
 import uuid
-from collections.abc import AsyncGenerator
+from collections import OrderedDict, deque
+from collections.abc import AsyncGenerator, Iterator, Sequence
 from pathlib import Path
 
 import streamlit as st
 
 # Import from the new multi-server MCP client
 from core.multi_client import MultiMCPClient
+from ui.async_loop import get_async_loop
 
 # Import schema from the main src directory
-src_path = Path(__file__).parent.parent.parent / "src"
-sys.path.insert(0, str(src_path))
+src_path = str(Path(__file__).parent.parent.parent / "src")
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
 from schema import ChatMessage
 
+logger = logging.getLogger(__name__)
 
-async def render_mcp_tab() -> None:
+# Chat history kept per session, and how much of it is sent to the AI as context
+MCP_HISTORY_LIMIT = 200
+MCP_CONTEXT_MESSAGES = 20
+
+# Most OpenAI bots kept in the shared pool; the least recently used is dropped beyond this
+MCP_MAX_BOTS = 8
+
+# Streamed replies are redrawn at most every 50 ms or every 64 new characters
+STREAM_FLUSH_INTERVAL = 0.05
+STREAM_FLUSH_CHARS = 64
+
+# Conversation-history prefixes for each ChatMessage type sent as context
+SPEAKER_LABELS = {"human": "User", "ai": "Assistant"}
+
+# Quick actions offered for each tool, in display order
+QUICK_ACTION_MAP: tuple[tuple[str, str], ...] = (
+    # Filesystem actions
+    ("list_directory", "List the contents of the directory"),
+    ("create_directory", "Create a new directory"),
+    ("read_file", "Read a file"),
+    ("write_file", "Write to a file"),
+    ("move_file", "Move or rename a file"),
+    ("get_file_info", "Get file information"),
+    ("search_files", "Search for a specific file"),
+    # Brave Search actions
+    ("brave_web_search", "Search the web"),
+    ("brave_image_search", "Search for images"),
+    ("brave_video_search", "Search for videos"),
+    ("brave_news_search", "Search for news"),
+    ("brave_local_search", "Search for local businesses"),
+    # GitHub actions
+    ("list_issues", "List repository issues"),
+    ("get_file_contents", "Get contents of a file from repository"),
+    ("create_repository", "Create a new repository"),
+    ("fork_repository", "Fork a repository"),
+    ("create_branch", "Create a new branch"),
+)
+
+# Quick actions that need no input from the model, run as direct tool calls: label -> (tool, arguments)
+QUICK_ACTION_CALLS: dict[str, tuple[str, dict]] = {
+    "List the contents of the directory": ("list_directory", {"path": "."}),
+}
+
+
+def _context_line(msg: ChatMessage) -> str:
+    """Render a message as a line of conversation context, or "" if it isn't sent as context"""
+    label = SPEAKER_LABELS.get(msg.type)
+    return f"{label}: {msg.content}\n" if label else ""
+
+
+class MCPConversation(deque):
+    """Session chat history that keeps the AI context for its latest messages rendered as they arrive"""
+    
+    def __init__(self, iterable=(), maxlen: int | None = MCP_HISTORY_LIMIT):
+        super().__init__(maxlen=maxlen)
+        self._context_lines: deque[str] = deque(maxlen=MCP_CONTEXT_MESSAGES)
+        self.extend(iterable)
+    
+    def append(self, msg: ChatMessage) -> None:
+        super().append(msg)
+        self._context_lines.append(_context_line(msg))
+    
+    def extend(self, messages) -> None:
+        for msg in messages:
+            self.append(msg)
+    
+    def context(self) -> str:
+        """Context text for the last MCP_CONTEXT_MESSAGES messages"""
+        return "".join(self._context_lines)
+
+
+def render_mcp_tab() -> None:
     """Render MCP tab with multi-server selection interface"""
     
     # Get or create user ID (following streamlit_app.py pattern)
     user_id = st.session_state.get("user_id", str(uuid.uuid4()))
     
-    # Initialize Multi-MCP client (like AgentClient initialization)
-    if "mcp_client" not in st.session_state:
-        try:
-            with st.spinner("Connecting to MCP servers..."):
-                st.session_state.mcp_client = MultiMCPClient()
-                await st.session_state.mcp_client.initialize()
-        except Exception as e:
-            st.error(f"Error connecting to MCP servers: {e}")
-            st.markdown("Make sure the MCP containers are running.")
-            st.stop()
-    
-    mcp_client: MultiMCPClient = st.session_state.mcp_client
+    # One Multi-MCP client is shared by every session and rerun
+    try:
+        mcp_client = get_mcp_client()
+        # Warm one bot per server now so the first message on any server doesn't pay for it
+        get_mcp_bots()
+    except Exception as e:
+        st.error(f"Error connecting to MCP servers: {e}")
+        st.markdown("Make sure the MCP containers are running.")
+        st.stop()
     
     # Initialize MCP messages and selected server (following streamlit_app.py pattern)
     if "mcp_messages" not in st.session_state:
-        st.session_state.mcp_messages = []
+        st.session_state.mcp_messages = MCPConversation()
         
     if "mcp_thread_id" not in st.session_state:
         st.session_state.mcp_thread_id = str(uuid.uuid4())
     
+    # The server summary is fixed once the shared client is up; fetch it once per rerun
+    available_servers = mcp_client.get_available_servers()
+    
     if "selected_mcp_server" not in st.session_state:
         # Set default to first available server
-        available_servers = mcp_client.get_available_servers()
         if available_servers:
             st.session_state.selected_mcp_server = list(available_servers.keys())[0]
         else:
@@ -57,60 +135,43 @@ async def render_mcp_tab() -> None:
     with st.sidebar:
         st.subheader("🛠️ MCP Servers")
         
+        # The chat area is drawn further down this run, so resetting state here needs no rerun
         if st.button(":material/chat: New MCP Chat", use_container_width=True):
-            st.session_state.mcp_messages = []
+            st.session_state.mcp_messages = MCPConversation()
             st.session_state.mcp_thread_id = str(uuid.uuid4())
-            st.rerun()
 
         # Server Selection
-        available_servers = mcp_client.get_available_servers()
         if available_servers:
-            server_options = {
-                server_id: f"{info['icon']} {info['name']}"
-                for server_id, info in available_servers.items()
-            }
+            server_options, option_keys = _server_options(mcp_client)
             
             selected_server = st.selectbox(
                 "Select MCP Server:",
-                options=list(server_options.keys()),
-                format_func=lambda x: server_options[x],
-                index=list(server_options.keys()).index(st.session_state.selected_mcp_server) 
+                options=option_keys,
+                format_func=server_options.__getitem__,
+                index=option_keys.index(st.session_state.selected_mcp_server) 
                       if st.session_state.selected_mcp_server in server_options else 0,
                 key="mcp_server_selector"
             )
             
-            # Update selected server
-            if selected_server != st.session_state.selected_mcp_server:
-                st.session_state.selected_mcp_server = selected_server
-                st.rerun()
+            # Update selected server; everything below already reads the new value
+            st.session_state.selected_mcp_server = selected_server
             
             # Show server info
             server_info = available_servers[selected_server]
             with st.expander(f"📋 {server_info['name']} Tools", expanded=True):
-                st.write(f"**{server_info['description']}**")
-                st.write(f"**{len(server_info['tools'])} tools available:**")
-                for tool_name in server_info['tools'][:8]:  # Show first 8 tools
-                    # Get tool description from server
-                    tool_details = mcp_client.get_server_tools(selected_server)
-                    tool_desc = tool_details.get(tool_name, {}).get('description', 'No description')
-                    st.write(f"• **{tool_name}**: {tool_desc}")
-                if len(server_info['tools']) > 8:
-                    st.write(f"... and {len(server_info['tools']) - 8} more tools")
+                # One element for the whole panel rather than one per line
+                st.markdown(_server_tools_markdown(mcp_client, selected_server))
         else:
             st.error("No MCP servers available")
             st.stop()
 
         with st.expander("🐳 MCP Server Status"):
-            for server_id, info in available_servers.items():
-                status_icon = "✅" if server_id == selected_server else "⚪"
-                st.write(f"{status_icon} {info['icon']} **{info['name']}**")
-                if server_id == selected_server:
-                    st.write(f"   *{info['description']}*")
+            st.markdown(_server_status_markdown(mcp_client, selected_server))
             
         with st.expander("💬 Conversation Tracking"):
             message_count = len(st.session_state.mcp_messages)
             st.info(f"📝 {message_count} messages in current conversation")
-            st.write("**Context**: Last 20 messages sent to AI")
+            st.write(f"**Context**: Last {MCP_CONTEXT_MESSAGES} messages sent to AI")
             if message_count > 0:
                 st.write(f"**Thread ID**: {st.session_state.mcp_thread_id[:8]}...")
 
@@ -118,195 +179,332 @@ async def render_mcp_tab() -> None:
     current_server_info = available_servers.get(st.session_state.selected_mcp_server or "", {})
     
     # Draw existing MCP messages (following streamlit_app.py pattern)
-    messages: list[ChatMessage] = st.session_state.mcp_messages
+    messages: MCPConversation = st.session_state.mcp_messages
 
-    # Display existing messages (following streamlit_app.py pattern)
-    async def amessage_iter() -> AsyncGenerator[ChatMessage, None]:
-        for m in messages:
-            yield m
-
-    await draw_mcp_messages(amessage_iter())
+    # Display existing messages; the history is already in memory, so draw it directly
+    draw_mcp_messages_sync(messages)
 
     # Quick action selector
     st.subheader(f"� {current_server_info.get('name', 'MCP Server')}")
     
     # Create dynamic quick actions based on available tools
-    server_tools = current_server_info.get('tools', [])
-    quick_actions = ["Select an action..."]
-    
-    # Add filesystem actions
-    if "list_directory" in server_tools:
-        quick_actions.append("List the contents of the directory")
-    if "create_directory" in server_tools:
-        quick_actions.append("Create a new directory")
-    if "read_file" in server_tools:
-        quick_actions.append("Read a file")
-    if "write_file" in server_tools:
-        quick_actions.append("Write to a file")
-    if "move_file" in server_tools:
-        quick_actions.append("Move or rename a file")
-    if "get_file_info" in server_tools:
-        quick_actions.append("Get file information")
-    if "search_files" in server_tools:
-        quick_actions.append("Search for a specific file")
-    
-    # Add Brave Search actions
-    if "brave_web_search" in server_tools:
-        quick_actions.append("Search the web")
-    if "brave_image_search" in server_tools:
-        quick_actions.append("Search for images")
-    if "brave_video_search" in server_tools:
-        quick_actions.append("Search for videos")
-    if "brave_news_search" in server_tools:
-        quick_actions.append("Search for news")
-    if "brave_local_search" in server_tools:
-        quick_actions.append("Search for local businesses")
-    if "list_issues" in server_tools:
-        quick_actions.append("List repository issues")
-    if "get_file_contents" in server_tools:
-        quick_actions.append("Get contents of a file from repository")
-    if "create_repository" in server_tools:
-        quick_actions.append("Create a new repository")
-    if "fork_repository" in server_tools:
-        quick_actions.append("Fork a repository")
-    if "create_branch" in server_tools:
-        quick_actions.append("Create a new branch")
+    quick_actions = _quick_actions(frozenset(current_server_info.get('tools', ())))
     
     # Create columns for better layout
     col1, col2 = st.columns([3, 1])
     
     with col1:
-        quick_action = st.selectbox(
-            "Choose an action:",
+        # Several actions can be picked and run as one request, so their tool calls go out together
+        selected_actions = st.multiselect(
+            "Choose actions:",
             quick_actions,
+            placeholder="Select an action...",
             key="mcp_quick_action"
         )
     
     with col2:
-        if st.button("Execute", use_container_width=True, type="primary"):
-            if quick_action != "Select an action..." and st.session_state.selected_mcp_server:
-                # Add the selected action as user message
-                user_message = ChatMessage(type="human", content=quick_action)
-                messages.append(user_message)
-                st.chat_message("human").write(quick_action)
-                
-                try:
-                    # Process with MCP (simplified - no streaming for now)
-                    ai_response = await process_mcp_message(
-                        quick_action, 
-                        mcp_client, 
-                        st.session_state.selected_mcp_server,
-                        messages
-                    )
-                    
-                    # Add AI response
-                    ai_message = ChatMessage(type="ai", content=ai_response)
-                    messages.append(ai_message)
-                    st.chat_message("ai").write(ai_response)
-                    
-                    st.rerun()  # Clear stale containers like streamlit_app.py
-                    
-                except Exception as e:
-                    st.error(f"Error processing MCP request: {e}")
-                    st.stop()
+        execute = st.button("Execute", use_container_width=True, type="primary")
+    
+    # Handled outside the column so the new messages render full width
+    if execute and selected_actions and st.session_state.selected_mcp_server:
+        direct = [action for action in selected_actions if action in QUICK_ACTION_CALLS]
+        prompted = [action for action in selected_actions if action not in QUICK_ACTION_CALLS]
+        if direct:
+            _handle_direct_actions(direct, mcp_client, st.session_state.selected_mcp_server, messages)
+        if prompted:
+            # Add the remaining actions as one user message for the AI to work out
+            _handle_user_turn(_quick_action_request(prompted), mcp_client, st.session_state.selected_mcp_server, messages)
 
     # Handle new user input (following streamlit_app.py pattern)
     if user_input := st.chat_input("Type your request..."):
         if st.session_state.selected_mcp_server:
-            # Add user message
-            user_message = ChatMessage(type="human", content=user_input)
-            messages.append(user_message)
-            st.chat_message("human").write(user_input)
-            
-            try:
-                # Process with MCP (simplified - no streaming for now)
-                ai_response = await process_mcp_message(
-                    user_input, 
-                    mcp_client, 
-                    st.session_state.selected_mcp_server,
-                    messages
-                )
-                
-                # Add AI response
-                ai_message = ChatMessage(type="ai", content=ai_response)
-                messages.append(ai_message)
-                st.chat_message("ai").write(ai_response)
-                
-                st.rerun()  # Clear stale containers like streamlit_app.py
-                
-            except Exception as e:
-                st.error(f"Error processing MCP request: {e}")
-                st.stop()
+            _handle_user_turn(user_input, mcp_client, st.session_state.selected_mcp_server, messages)
         else:
             st.error("Please select an MCP server first!")
 
 
+# The sidebar text below only depends on the shared client's fixed server summary,
+# so it is built once per (client, server) instead of on every rerun
+
+@functools.lru_cache(maxsize=4)
+def _server_options(mcp_client: MultiMCPClient) -> tuple[dict[str, str], list[str]]:
+    """Server selector labels and the option keys in display order"""
+    server_options = {
+        server_id: f"{info['icon']} {info['name']}"
+        for server_id, info in mcp_client.get_available_servers().items()
+    }
+    return server_options, list(server_options)
+
+
+@functools.lru_cache(maxsize=32)
+def _server_tools_markdown(mcp_client: MultiMCPClient, server_id: str) -> str:
+    """Tools panel text for a server: its description and first 8 tools"""
+    server_info = mcp_client.get_available_servers()[server_id]
+    total_tools = len(server_info['tools'])
+    tools_slice = server_info['tools'][:8]  # Show first 8 tools
+    # Get tool descriptions from server once for the whole list
+    tool_details = mcp_client.get_server_tools(server_id)
+    lines = [
+        f"**{server_info['description']}**",
+        f"**{total_tools} tools available:**",
+        *(
+            f"• **{tool_name}**: {tool_details.get(tool_name, {}).get('description', 'No description')}"
+            for tool_name in tools_slice
+        ),
+    ]
+    if total_tools > 8:
+        lines.append(f"... and {total_tools - 8} more tools")
+    return "\n\n".join(lines)
+
+
+@functools.lru_cache(maxsize=32)
+def _server_status_markdown(mcp_client: MultiMCPClient, selected_server: str) -> str:
+    """Status panel text listing every server, with the selected one marked"""
+    lines = []
+    for server_id, info in mcp_client.get_available_servers().items():
+        status_icon = "✅" if server_id == selected_server else "⚪"
+        lines.append(f"{status_icon} {info['icon']} **{info['name']}**")
+        if server_id == selected_server:
+            lines.append(f"*{info['description']}*")
+    # Servers that failed to start are listed too, so they don't just vanish
+    for info in mcp_client.failed_servers.values():
+        lines.append(f"❌ {info['icon']} **{info['name']}** (unavailable)")
+    return "\n\n".join(lines)
+
+
+@functools.lru_cache(maxsize=32)
+def _quick_actions(tools: frozenset[str]) -> tuple[str, ...]:
+    """Quick action labels for a server's tool set; the set is fixed, so this is computed once per server"""
+    return tuple(label for tool, label in QUICK_ACTION_MAP if tool in tools)
+
+
+def _quick_action_request(actions: Sequence[str]) -> str:
+    """Combine quick actions into a single request"""
+    if len(actions) == 1:
+        return actions[0]
+    steps = "\n".join(f"{number}. {action}" for number, action in enumerate(actions, 1))
+    return f"Do all of the following; they are independent, so run the tools together:\n{steps}"
+
+
+@st.cache_resource(show_spinner="Connecting to MCP servers...")
+def get_mcp_client() -> MultiMCPClient:
+    """Create and initialize the process-wide Multi-MCP client on the shared event loop"""
+    async def connect() -> MultiMCPClient:
+        client = MultiMCPClient()
+        if not await client.initialize():
+            # Raising keeps a failed client out of the cache, so the next rerun retries
+            await client.close()
+            raise RuntimeError("No MCP servers could be initialized")
+        return client
+    
+    return get_async_loop().run(connect())
+
+
+@st.cache_resource(show_spinner=False)
+def get_mcp_bots() -> OrderedDict:
+    """Get the shared OpenAI bot pool, one bot per server, warmed on first use"""
+    return get_async_loop().run(_prewarm_bots(get_mcp_client()))
+
+
+@functools.cache
+def _bot_class() -> type:
+    """Import the OpenAI bot on first use (deferred to avoid circular imports)"""
+    from core.mcp_openai_bot import MCPOpenAIBot
+    return MCPOpenAIBot
+
+
+async def _prewarm_bots(mcp_client: MultiMCPClient) -> OrderedDict:
+    """Create and initialize one OpenAI bot per available server concurrently"""
+    try:
+        bot_class = _bot_class()
+        bots = OrderedDict(
+            (server_id, bot_class(server_id, mcp_client))
+            for server_id in itertools.islice(mcp_client.get_available_servers(), MCP_MAX_BOTS)
+        )
+    except Exception as e:
+        # Bots are created lazily on first message instead, where errors reach the chat
+        logger.warning("Skipping bot warm-up: %s", e)
+        return OrderedDict()
+    
+    # Only bots that came up fully are pooled; the rest are retried on first message
+    results = await asyncio.gather(*(bot.initialize() for bot in bots.values()), return_exceptions=True)
+    for server_id, result in zip(list(bots), results):
+        if result is not True:
+            logger.warning("Bot warm-up failed for %s: %s", server_id, result)
+            del bots[server_id]
+    return bots
+
+
+def _handle_user_turn(text: str, mcp_client: MultiMCPClient, selected_server: str, messages: MCPConversation) -> None:
+    """Add a user message and stream the MCP reply into the chat"""
+    user_message = ChatMessage(type="human", content=text)
+    messages.append(user_message)
+    st.chat_message("human").write(text)
+    
+    try:
+        # Process with MCP on the shared loop, showing the reply as it streams in
+        ai_response = write_streamed_response(get_async_loop().iterate(stream_mcp_message(
+            text, 
+            mcp_client, 
+            selected_server,
+            messages,
+            bots=get_mcp_bots()
+        )))
+        
+        # Add AI response; both messages are already on the page, so no forced rerun is needed
+        ai_message = ChatMessage(type="ai", content=ai_response)
+        messages.append(ai_message)
+        
+    except Exception as e:
+        st.error(f"Error processing MCP request: {e}")
+        st.stop()
+
+
+def _handle_direct_actions(actions: Sequence[str], mcp_client: MultiMCPClient, selected_server: str, messages: MCPConversation) -> None:
+    """Run fixed quick actions as one batch of tool calls and show their raw results, skipping the AI"""
+    try:
+        results = get_async_loop().run(mcp_client.call_tools(
+            selected_server, [QUICK_ACTION_CALLS[action] for action in actions]
+        ))
+    except Exception as e:
+        st.error(f"Error processing MCP request: {e}")
+        st.stop()
+    
+    for action, result in zip(actions, results):
+        reply = f"```\n{_bot_class()._format_tool_result(result)}\n```"
+        messages.append(ChatMessage(type="human", content=action))
+        messages.append(ChatMessage(type="ai", content=reply))
+        st.chat_message("human").write(action)
+        st.chat_message("ai").write(reply)
+
+
 async def draw_mcp_messages(
     messages_agen: AsyncGenerator[ChatMessage, None],
 ) -> None:
     """Draw MCP messages - simplified version of streamlit_app.py draw_messages"""
     
     # Iterate over messages and draw them (following streamlit_app.py pattern)
-    while msg := await anext(messages_agen, None):
-        if not isinstance(msg, ChatMessage):
-            st.error(f"Unexpected message type: {type(msg)}")
-            continue
-            
-        match msg.type:
-            case "human":
-                st.chat_message("human").write(msg.content)
-            case "ai":
-                st.chat_message("ai").write(msg.content)
-            case _:
-                st.error(f"Unexpected ChatMessage type: {msg.type}")
+    async for msg in messages_agen:
+        _draw_mcp_message(msg)
 
 
-async def process_mcp_message(user_input: str, mcp_client: MultiMCPClient, selected_server: str, conversation_history: list[ChatMessage] | None = None) -> str:
-    """Process user message with MCP tools via OpenAI with conversation context"""
+def draw_mcp_messages_sync(messages: Sequence[ChatMessage]) -> None:
+    """Draw an in-memory list of MCP messages without going through an async generator"""
+    for msg_type, group in itertools.groupby(messages, key=_chat_type):
+        if msg_type in _RENDERERS:
+            # Adjacent messages from the same speaker share one chat bubble
+            with st.chat_message(msg_type):
+                for msg in group:
+                    st.write(msg.content)
+        else:
+            for msg in group:
+                _draw_mcp_message(msg)
+
+
+def _chat_type(msg: ChatMessage) -> str | None:
+    """Grouping key for draw_mcp_messages_sync; None for anything that is not a ChatMessage"""
+    return msg.type if isinstance(msg, ChatMessage) else None
+
+
+# Chat renderers for each ChatMessage type shown in the MCP tab
+_RENDERERS = {
+    "human": lambda content: st.chat_message("human").write(content),
+    "ai": lambda content: st.chat_message("ai").write(content),
+}
+
+
+def _draw_mcp_message(msg: ChatMessage) -> None:
+    """Draw a single MCP message"""
+    if not isinstance(msg, ChatMessage):
+        st.error(f"Unexpected message type: {type(msg)}")
+        return
+        
+    renderer = _RENDERERS.get(msg.type)
+    if renderer is None:
+        st.error(f"Unexpected ChatMessage type: {msg.type}")
+    else:
+        renderer(msg.content)
+
+
+def write_streamed_response(chunks: Iterator[str]) -> str:
+    """Write streamed reply chunks into one AI chat message and return the full text"""
+    placeholder = st.chat_message("ai").empty()
+    response = ""
+    pending = 0
+    last_flush = time.monotonic()
     
-    # Import the OpenAI bot here to avoid circular imports
-    from core.mcp_openai_bot import MCPOpenAIBot
+    # Redraw on a timer or once enough text has built up, not on every token
+    for chunk in chunks:
+        response += chunk
+        pending += len(chunk)
+        now = time.monotonic()
+        if now - last_flush > STREAM_FLUSH_INTERVAL or pending >= STREAM_FLUSH_CHARS:
+            placeholder.write(response)
+            pending = 0
+            last_flush = now
+    
+    placeholder.write(response)
+    return response
+
+
+async def stream_mcp_message(user_input: str, mcp_client: MultiMCPClient, selected_server: str, conversation_history: Sequence[ChatMessage] | None = None, bots: OrderedDict | None = None) -> AsyncGenerator[str, None]:
+    """Process user message with MCP tools via OpenAI with conversation context, yielding the reply as it streams"""
     
     try:
-        # Get or create persistent bot instance for the selected server
-        bot_key = f"mcp_bot_{selected_server}"
-        if bot_key not in st.session_state or st.session_state[bot_key] is None:
-            # Create a new bot instance for this server, using the persistent MCP client
-            st.session_state[bot_key] = MCPOpenAIBot(selected_server, mcp_client)
-            await st.session_state[bot_key].initialize()
+        server_info = mcp_client.get_available_servers().get(selected_server, {})
         
-        bot: MCPOpenAIBot = st.session_state[bot_key]
+        # Get the pooled bot for the selected server, creating it if warm-up didn't
+        if bots is None:
+            bots = st.session_state.setdefault("mcp_bots", OrderedDict())
+        bot = bots.get(selected_server)
+        if bot is None:
+            # Create a new bot instance for this server, using the persistent MCP client.
+            # It is pooled only once fully initialized, since other sessions share the pool
+            bot = _bot_class()(selected_server, mcp_client)
+            if await bot.initialize():
+                bots[selected_server] = bot
+        if selected_server in bots:
+            bots.move_to_end(selected_server)
+            while len(bots) > MCP_MAX_BOTS:
+                bots.popitem(last=False)
         
         # Build conversation context if provided
-        if conversation_history:
-            # Convert ChatMessage history to OpenAI format
+        if isinstance(conversation_history, MCPConversation):
+            # The session history keeps its recent lines rendered as messages are added
+            conversation_context = conversation_history.context()
+        elif conversation_history:
+            # Convert ChatMessage history to OpenAI format, joining once instead of growing a string
+            # islice rather than a slice, since the session history is a deque
+            recent = itertools.islice(
+                conversation_history, max(len(conversation_history) - MCP_CONTEXT_MESSAGES, 0), None
+            )
+            conversation_context = "".join([_context_line(msg) for msg in recent])
+        else:
             conversation_context = ""
-            for msg in conversation_history[-20:]:  # Keep last 20 messages for context
-                if msg.type == "human":
-                    conversation_context += f"User: {msg.content}\n"
-                elif msg.type == "ai":
-                    conversation_context += f"Assistant: {msg.content}\n"
-            
-            # Add context to the current message
-            if conversation_context:
-                contextual_input = f"Previous conversation:\n{conversation_context}\nCurrent request: {user_input}"
-            else:
-                contextual_input = user_input
+        
+        # Add context to the current message
+        if conversation_context:
+            contextual_input = f"Previous conversation:\n{conversation_context}\nCurrent request: {user_input}"
         else:
             contextual_input = user_input
         
         # Add server context to the message
-        server_info = mcp_client.get_available_servers().get(selected_server, {})
         server_context = f"You are working with {server_info.get('name', 'MCP Server')} ({selected_server}). "
         full_input = server_context + contextual_input
         
         # Use the persistent OpenAI bot to process the message with context
-        response = await bot.chat(full_input)
+        async for chunk in bot.stream_chat(full_input):
+            yield chunk
         
         # DO NOT close the bot - keep it persistent for future requests
         # await bot.close()  # <-- Removed this line
         
-        return response
-        
     except Exception as e:
-        return f"Sorry, I encountered an error processing your request: {str(e)}"
\ No newline at end of file
+        yield f"Sorry, I encountered an error processing your request: {str(e)}"
+
+
+async def process_mcp_message(user_input: str, mcp_client: MultiMCPClient, selected_server: str, conversation_history: Sequence[ChatMessage] | None = None) -> str:
+    """Process user message with MCP tools via OpenAI with conversation context"""
+    return "".join([
+        chunk async for chunk in stream_mcp_message(user_input, mcp_client, selected_server, conversation_history)
+    ])
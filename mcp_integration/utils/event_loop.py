@@ -0,0 +1,28 @@
+"""
+Event loop runner for MCP entry points.
+Uses uvloop when it is installed, which cuts scheduling overhead for the
+subprocess and HTTP I/O the MCP clients spend their time on.
+"""
+import asyncio
+from collections.abc import Callable, Coroutine
+from typing import Any, TypeVar
+
+try:
+    import uvloop
+except ImportError:  # pragma: no cover - uvloop is unavailable on Windows and optional elsewhere
+    uvloop = None
+
+T = TypeVar("T")
+
+
+def new_event_loop() -> asyncio.AbstractEventLoop:
+    """Create a uvloop loop if available, otherwise a default asyncio loop"""
+    if uvloop is not None:
+        return uvloop.new_event_loop()
+    return asyncio.new_event_loop()
+
+
+def run_event_loop(main: Coroutine[Any, Any, T], *, loop_factory: Callable[[], asyncio.AbstractEventLoop] | None = None) -> T:
+    """Drop-in for asyncio.run() that runs on uvloop when it is installed"""
+    with asyncio.Runner(loop_factory=loop_factory or new_event_loop) as runner:
+        return runner.run(main)
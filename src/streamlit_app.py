@@ -15,15 +15,18 @@ from schema import ChatHistory, ChatMessage
 from schema.task_data import TaskData, TaskDataStatus
 
 # Add mcp_integration to path for MCP functionality
-mcp_path = Path(__file__).parent.parent / "mcp_integration"
-sys.path.insert(0, str(mcp_path))
+# (the script reruns on every interaction, so add it only once)
+mcp_path = str(Path(__file__).parent.parent / "mcp_integration")
+if mcp_path not in sys.path:
+    sys.path.insert(0, mcp_path)
 
 # Import MCP tab functionality
 try:
-    from mcp_tab import render_mcp_tab
+    from mcp_tab import render_mcp_tab, run_event_loop
     MCP_AVAILABLE = True
 except ImportError:
     MCP_AVAILABLE = False
+    run_event_loop = asyncio.run
 
 # A Streamlit app for interacting with the langgraph agent via a simple chat interface.
 # The app has three main functions which are all run async:
@@ -261,7 +264,7 @@ async def main() -> None:
     # MCP Tab
     if MCP_AVAILABLE:
         with tab2:
-            await render_mcp_tab()
+            render_mcp_tab()
 
 
 async def draw_messages(
@@ -497,4 +500,4 @@ async def handle_agent_msgs(messages_agen, call_results, is_new):
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run_event_loop(main())
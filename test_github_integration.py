@@ -58,7 +58,7 @@ async def test_github_integration():
                 print("📊 Sample result:")
                 content = result["content"][0]["text"]
                 # Print first few lines of result
-                lines = content.split("\n")[:5]
+                lines = content.split("\n", 5)[:5]
                 for line in lines:
                     print(f"   {line}")
             return True
@@ -70,7 +70,13 @@ async def test_github_integration():
         return False
 
 if __name__ == "__main__":
-    result = asyncio.run(test_github_integration())
+    # Prefer uvloop via the shared runner when mcp_integration is importable
+    try:
+        from utils.event_loop import run_event_loop
+    except ImportError:
+        run_event_loop = asyncio.run
+    
+    result = run_event_loop(test_github_integration())
     if result:
         print("\n🎉 GitHub MCP Server integration test PASSED!")
     else:
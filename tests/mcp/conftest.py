@@ -0,0 +1,28 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# The MCP clients are imported the way the Streamlit app imports them, with mcp_integration on
+# sys.path; appended so its packages never shadow the ones under src/
+sys.path.append(str(Path(__file__).parents[2] / "mcp_integration"))
+
+FAKE_DOCKER = Path(__file__).with_name("fake_docker.py")
+
+
+@pytest.fixture
+def fake_docker(tmp_path, monkeypatch):
+    """Put a stand-in `docker` first on PATH; returns the file it logs each invocation to."""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    docker = bin_dir / "docker"
+    docker.write_text(f'#!/bin/sh\nexec "{sys.executable}" "{FAKE_DOCKER}" "$@"\n')
+    docker.chmod(0o755)
+
+    log = tmp_path / "docker.log"
+    log.touch()
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv("FAKE_DOCKER_LOG", str(log))
+    monkeypatch.delenv("BRAVE_MCP_URL", raising=False)
+    return log
@@ -0,0 +1,81 @@
+"""
+Stand-in for the docker CLI used by the MCP client tests.
+`inspect` reports the container running, `exec ... node` speaks a minimal MCP
+server over stdio, and any other `exec` command runs locally.
+"""
+
+import json
+import os
+import sys
+
+
+def handle(request: dict) -> dict | None:
+    """Answer one JSON-RPC request; None for notifications and dropped calls"""
+    if "id" not in request:
+        return None
+    method = request.get("method")
+    if method == "initialize":
+        result = {
+            "protocolVersion": os.environ.get("FAKE_MCP_PROTOCOL", "2025-03-26"),
+            "capabilities": {"tools": {}},
+            "serverInfo": {"name": "fake", "version": "0"},
+        }
+    elif method == "tools/call":
+        params = request["params"]
+        # A query of "hang" is never answered, like a wedged server
+        if params["arguments"].get("query") == "hang":
+            return None
+        text = f"{params['name']}:{json.dumps(params['arguments'], sort_keys=True)}"
+        result = {"content": [{"type": "text", "text": text}]}
+    else:
+        return {
+            "jsonrpc": "2.0",
+            "id": request["id"],
+            "error": {"code": -32601, "message": "not found"},
+        }
+    return {"jsonrpc": "2.0", "id": request["id"], "result": result}
+
+
+def serve():
+    """Run the fake MCP server on stdin/stdout"""
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        message = json.loads(line)
+        if isinstance(message, list):
+            # Servers that don't understand batches may drop them silently
+            if os.environ.get("FAKE_MCP_NOBATCH"):
+                continue
+            response = [r for r in map(handle, message) if r is not None]
+        else:
+            response = handle(message)
+        if response:
+            sys.stdout.write(json.dumps(response) + "\n")
+            sys.stdout.flush()
+
+
+def main():
+    args = sys.argv[1:]
+    log = os.environ.get("FAKE_DOCKER_LOG")
+    if log:
+        with open(log, "a") as f:
+            f.write(" ".join(args) + "\n")
+
+    if args[0] == "inspect":
+        print("true")
+        return
+    if args[0] != "exec":
+        sys.exit(1)
+
+    args = args[1:]
+    while args[0].startswith("-"):
+        args = args[1:]
+    command = args[1:]
+    if command[0] == "node":
+        serve()
+    else:
+        os.execvp(command[0], command)
+
+
+if __name__ == "__main__":
+    main()
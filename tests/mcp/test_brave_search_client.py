@@ -0,0 +1,160 @@
+import asyncio
+import json
+import socket
+
+import pytest
+import pytest_asyncio
+from aiohttp import ClientResponseError, web
+from aiohttp.test_utils import TestServer
+from clients.brave_search_client import BraveSearchClient
+
+
+def node_sessions(log) -> int:
+    """Number of MCP server processes the client started"""
+    return sum(" node " in line for line in log.read_text().splitlines())
+
+
+def result_text(result: dict) -> str:
+    assert "error" not in result, result
+    return result["content"][0]["text"]
+
+
+@pytest_asyncio.fixture
+async def brave(fake_docker):
+    client = BraveSearchClient({"container_name": "brave-test", "request_timeout": 0.5})
+    assert await client.initialize()
+    yield client
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_session(brave, fake_docker):
+    """Concurrent calls are multiplexed over one session and each gets its own response."""
+    queries = [f"query {i}" for i in range(10)]
+    results = await asyncio.gather(
+        *(brave.call_tool("brave_web_search", {"query": query}) for query in queries)
+    )
+
+    for query, result in zip(queries, results):
+        assert result_text(result) == "brave_web_search:" + json.dumps({"query": query})
+    assert node_sessions(fake_docker) == 1
+
+
+@pytest.mark.asyncio
+async def test_repeated_call_is_served_from_cache(brave):
+    """An identical call reuses the earlier result without another request."""
+    first = await brave.call_tool("brave_web_search", {"query": "cached"})
+    await brave._stop_session()
+
+    second = await brave.call_tool("brave_web_search", {"query": "cached"})
+
+    assert second == first
+    assert brave._proc is None
+
+
+@pytest.mark.asyncio
+async def test_batch(brave):
+    """Batched calls come back in call order."""
+    assert brave._supports_batch
+    calls = [("brave_web_search", {"query": "a"}), ("brave_news_search", {"query": "b"})]
+
+    results = await brave.call_tools_batch(calls)
+
+    assert [result_text(result) for result in results] == [
+        'brave_web_search:{"query": "a"}',
+        'brave_news_search:{"query": "b"}',
+    ]
+
+
+@pytest.mark.asyncio
+async def test_unanswered_request_times_out_and_restarts_session(brave, fake_docker):
+    """A request the server never answers times out, and the next call gets a fresh session."""
+    result = await asyncio.wait_for(brave.call_tool("brave_web_search", {"query": "hang"}), 5)
+    assert "timed out" in result["error"]
+
+    result = await brave.call_tool("brave_web_search", {"query": "after"})
+    assert result_text(result) == 'brave_web_search:{"query": "after"}'
+    assert node_sessions(fake_docker) == 2
+
+
+@pytest.mark.asyncio
+async def test_timeout_fails_other_pending_requests(brave):
+    """Requests sharing the abandoned session are failed then, not left to time out themselves."""
+    loop = asyncio.get_running_loop()
+    first = asyncio.create_task(brave.call_tool("brave_web_search", {"query": "hang"}))
+    await asyncio.sleep(0.25)
+    started = loop.time()
+    second = await brave.call_tool("brave_news_search", {"query": "hang"})
+
+    assert "error" in second
+    assert loop.time() - started < brave.request_timeout - 0.1
+    assert "error" in await first
+
+
+@pytest.mark.asyncio
+async def test_dropped_batch_falls_back_to_single_requests(fake_docker, monkeypatch):
+    """A server that silently drops batch arrays is answered one request at a time."""
+    monkeypatch.setenv("FAKE_MCP_NOBATCH", "1")
+    brave = BraveSearchClient({"container_name": "brave-test", "request_timeout": 0.5})
+    assert await brave.initialize()
+    try:
+        calls = [("brave_web_search", {"query": str(i)}) for i in range(3)]
+
+        results = await brave.call_tools_batch(calls)
+
+        assert [result_text(result) for result in results] == [
+            f'brave_web_search:{{"query": "{i}"}}' for i in range(3)
+        ]
+        assert not brave._supports_batch
+
+        # Later batches go straight to single requests rather than waiting out the timeout again
+        calls = [("brave_web_search", {"query": f"again {i}"}) for i in range(3)]
+        results = await asyncio.wait_for(brave.call_tools_batch(calls), 0.4)
+        assert all("error" not in result for result in results)
+    finally:
+        await brave.close()
+
+
+@pytest.fixture
+def unused_url(monkeypatch):
+    """An HTTP MCP endpoint nothing listens on"""
+    monkeypatch.delenv("BRAVE_MCP_URL", raising=False)
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}/mcp"
+
+
+@pytest.mark.asyncio
+async def test_failed_http_handshake_closes_the_connection_pool(unused_url):
+    """A handshake that cannot connect leaves no session behind to be mistaken for a live one."""
+    brave = BraveSearchClient({"url": unused_url, "request_timeout": 0.5})
+
+    assert not await brave.initialize()
+
+    assert brave._http is None
+    assert not brave._session_alive()
+
+
+@pytest.mark.asyncio
+async def test_http_error_during_handshake_is_not_a_session(monkeypatch):
+    """A 5xx answer to initialize fails the handshake and the next call tries it again."""
+    monkeypatch.delenv("BRAVE_MCP_URL", raising=False)
+    requests = []
+
+    async def handler(request):
+        requests.append(await request.json())
+        return web.Response(status=500)
+
+    app = web.Application()
+    app.router.add_post("/mcp", handler)
+    async with TestServer(app) as server:
+        brave = BraveSearchClient({"url": str(server.make_url("/mcp")), "request_timeout": 0.5})
+
+        assert not await brave.initialize()
+        assert brave._http is None
+        with pytest.raises(ClientResponseError):
+            await brave._ensure_session()
+        assert brave._http is None
+
+    assert [request["method"] for request in requests] == ["initialize", "initialize"]
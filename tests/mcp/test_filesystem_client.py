@@ -0,0 +1,199 @@
+import asyncio
+
+import pytest
+import pytest_asyncio
+from clients.filesystem_client import FilesystemClient
+
+
+def result_text(result: dict) -> str:
+    assert "error" not in result, result
+    return result["content"][0]["text"]
+
+
+@pytest_asyncio.fixture
+async def fs(fake_docker, tmp_path):
+    root = tmp_path / "projects"
+    root.mkdir()
+    client = FilesystemClient(
+        {
+            "container_name": "fs-test",
+            "server_path": str(root),
+            "pool_size": 2,
+            "command_timeout": 1,
+        }
+    )
+    assert await client.initialize()
+    yield client
+    await client.close()
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        "plain text\n",
+        "quotes ' \" and `backticks` $HOME $(echo no) \\n %s %d",
+        "-n leading dash",
+        "unicode ✓ — ünïcödé",
+        "",
+    ],
+)
+@pytest.mark.asyncio
+async def test_write_file_keeps_content_verbatim(fs, content):
+    """Shell metacharacters and printf escapes in the content are written as-is."""
+    path = f"{fs.server_path}/note 'quoted' $name.txt"
+
+    assert "error" not in await fs.call_tool("write_file", {"path": path, "content": content})
+
+    assert result_text(await fs.call_tool("read_file", {"path": path})) == content
+
+
+@pytest.mark.asyncio
+async def test_large_write_goes_through_stdin(fs):
+    """Content too big for a command-line argument is piped in through a one-off exec."""
+    content = "0123456789abcdef" * 10_000 + "\n'end'"
+    path = f"{fs.server_path}/large.txt"
+
+    assert "error" not in await fs.call_tool("write_file", {"path": path, "content": content})
+
+    assert result_text(await fs.call_tool("read_file", {"path": path})) == content
+
+
+@pytest.mark.asyncio
+async def test_failed_command_reports_stderr(fs):
+    """A failing command's stderr is surfaced and the shell stays usable."""
+    result = await fs.call_tool("read_file", {"path": f"{fs.server_path}/missing.txt"})
+
+    assert "No such file" in result["error"]
+    assert result_text(await fs.call_tool("list_directory", {"path": fs.server_path}))
+
+
+@pytest.mark.parametrize("path", ["../outside.txt", "/etc/passwd", "sub/../../outside.txt"])
+@pytest.mark.asyncio
+async def test_paths_outside_the_root_are_rejected(fs, path):
+    """Paths that resolve outside server_path are refused before anything runs."""
+    result = await fs.call_tool("write_file", {"path": path, "content": "x"})
+
+    assert "outside" in result["error"]
+
+
+@pytest.mark.asyncio
+async def test_relative_and_dotted_paths_resolve_under_the_root(fs):
+    """Relative paths and '..' segments that stay inside the root are normalised."""
+    await fs.call_tool("create_directory", {"path": "sub"})
+    await fs.call_tool("write_file", {"path": "sub/./x/../file.txt", "content": "inside"})
+
+    result = await fs.call_tool("read_file", {"path": f"{fs.server_path}/sub/file.txt"})
+
+    assert result_text(result) == "inside"
+
+
+@pytest.mark.asyncio
+async def test_write_file_invalidates_cached_listing(fs):
+    """A cached listing is dropped once a write changes the tree, whatever spelling its path used."""
+    before = result_text(await fs.call_tool("list_directory", {"path": fs.server_path}))
+    assert "new.txt" not in before
+
+    await fs.call_tool("write_file", {"path": "./new.txt", "content": "x"})
+
+    after = result_text(await fs.call_tool("list_directory", {"path": f"{fs.server_path}/"}))
+    assert "new.txt" in after
+
+
+def shells_spawned(log) -> int:
+    """Number of persistent shells the client started"""
+    return sum(line.endswith(" fs-test sh") for line in log.read_text().splitlines())
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_are_spread_over_the_pool(fs, fake_docker):
+    """Concurrent commands run on up to pool_size shells, and those shells are reused."""
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+
+    results = await asyncio.gather(*(fs._run_docker_command(["sleep", "0.3"]) for _ in range(4)))
+
+    assert all(result["success"] for result in results)
+    # Two shells running two rounds, rather than four commands in sequence
+    assert loop.time() - started < 1.1
+    assert shells_spawned(fake_docker) == 2
+    assert len(fs._idle_shells) == 2
+
+
+@pytest.mark.asyncio
+async def test_dead_shell_is_replaced(fs, fake_docker):
+    """A pooled shell that died between calls is discarded and a fresh one spawned."""
+    for shell in list(fs._shells):
+        shell.kill()
+        await shell.wait()
+
+    result = await fs.call_tool("list_directory", {"path": fs.server_path})
+
+    assert result_text(result).startswith(f"Directory listing for {fs.server_path}")
+    assert shells_spawned(fake_docker) == 2
+    assert all(shell.returncode is None for shell in fs._idle_shells)
+
+
+@pytest.mark.asyncio
+async def test_heavy_stderr_does_not_stall_the_shell(fs):
+    """stderr is drained alongside stdout, so a chatty command cannot fill the pipe and hang."""
+    command = ["sh", "-c", "head -c 2000000 /dev/zero | tr '\\0' e >&2; echo done"]
+
+    result = await asyncio.wait_for(fs._run_docker_command(command), 10)
+
+    assert result["success"]
+    assert result["output"].strip() == "done"
+
+
+@pytest.mark.asyncio
+async def test_stuck_command_times_out_and_drops_its_shell(fs):
+    """A command that outlives command_timeout is reported and its shell is not reused."""
+    result = await asyncio.wait_for(fs._run_docker_command(["sleep", "2"]), 5)
+
+    assert not result["success"]
+    assert "timed out" in result["error"]
+    assert not fs._idle_shells
+    assert result_text(await fs.call_tool("list_directory", {"path": fs.server_path}))
+
+    # The orphaned sleep still holds the dropped shell's pipes; let it exit before the loop closes
+    await asyncio.sleep(1.5)
+
+
+@pytest.mark.asyncio
+async def test_batched_write_invalidates_cached_listing(fs):
+    """Writes sent in a batch drop cached lookups too, and lookups beside them are not cached."""
+    await fs.call_tool("list_directory", {"path": fs.server_path})
+
+    await fs.call_tools_batch(
+        [
+            ("write_file", {"path": "batched.txt", "content": "x"}),
+            ("list_directory", {"path": fs.server_path}),
+        ]
+    )
+
+    result = await fs.call_tool("list_directory", {"path": fs.server_path})
+    assert "batched.txt" in result_text(result)
+
+
+@pytest.mark.asyncio
+async def test_lookup_overlapping_a_write_is_not_cached(fs, monkeypatch):
+    """A listing taken before a write but finishing after it is returned, not kept for later reads."""
+    listed = asyncio.Event()
+    written = asyncio.Event()
+    run = fs._run_docker_command
+
+    async def run_listing_across_write(command, *args):
+        output = await run(command, *args)
+        if command[0] == "ls":
+            listed.set()
+            await written.wait()
+        return output
+
+    monkeypatch.setattr(fs, "_run_docker_command", run_listing_across_write)
+    lookup = asyncio.create_task(fs.call_tool("list_directory", {"path": fs.server_path}))
+    await listed.wait()
+    await fs.call_tool("write_file", {"path": "late.txt", "content": "x"})
+    written.set()
+    assert "late.txt" not in result_text(await lookup)
+
+    result = await fs.call_tool("list_directory", {"path": fs.server_path})
+    assert "late.txt" in result_text(result)